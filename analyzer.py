@@ -1,9 +1,17 @@
+import hashlib
 import json
 import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-from anthropic import Anthropic
+from anthropic import Anthropic, DefaultHttpxClient, DEFAULT_CONNECTION_LIMITS, Timeout
+
+import jsonio
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,9 +26,65 @@ load_dotenv()
 # Configuration
 CURRENT_ITEMS_FILE = Path('data/current_items.json')
 ANALYZED_FILE = Path('data/analyzed_items.json')
-
-# Initialize Claude client (uses ANTHROPIC_API_KEY from environment)
-client = Anthropic()
+ANALYSIS_CACHE_FILE = Path('data/analysis_cache.db')
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Bump whenever SYSTEM_PROMPT or the request format changes so cached
+# analyses from the old prompt are not reused
+PROMPT_VERSION = "v2"
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 200
+MAX_DESCRIPTION_CHARS = 1200
+
+# Runs with at least this many items go through the Message Batches API
+# (half price, no per-request rate limits) instead of one call per item
+BATCH_MIN_ITEMS = int(os.getenv('ANALYZER_BATCH_MIN_ITEMS', 50))
+BATCH_POLL_INITIAL_SECONDS = 10
+BATCH_POLL_MAX_SECONDS = 120
+# Give up on (and cancel) a batch that hasn't ended after this long
+BATCH_TIMEOUT_SECONDS = int(os.getenv('ANALYZER_BATCH_TIMEOUT_SECONDS', 2 * 60 * 60))
+
+# Opt-in latency-optimized inference for per-item requests. Only endpoints
+# that offer it (e.g. Bedrock in supported regions) accept this option, so
+# leave ANTHROPIC_LATENCY_OPTIMIZED unset for the first-party API.
+LATENCY_OPTIMIZED = os.getenv('ANTHROPIC_LATENCY_OPTIMIZED') == '1'
+LATENCY_OPTIMIZED_OPTIONS = {"extra_body": {"performanceConfig": {"latency": "optimized"}}}
+
+# Retries per request on 429/529/5xx and connection errors. The SDK backs
+# off exponentially with jitter and honors the Retry-After header.
+ANTHROPIC_MAX_RETRIES = int(os.getenv('ANTHROPIC_MAX_RETRIES', 5))
+
+# Maximum number of per-item requests in flight at once
+ANALYZER_CONCURRENCY = int(os.getenv('ANALYZER_CONCURRENCY', 10))
+
+# Prompt cache token counts for the current run
+cache_stats = {"read": 0, "created": 0}
+_cache_stats_lock = threading.Lock()
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Persistent analysis cache (opened lazily, shared across worker threads)
+_cache_db = None
+_cache_db_lock = threading.Lock()
+
+# Limits comes from the SDK's own default rather than a direct httpx
+# import, so this follows whichever httpx build the SDK depends on.
+_PoolLimits = type(DEFAULT_CONNECTION_LIMITS)
+
+# Initialize Claude client (uses ANTHROPIC_API_KEY from environment).
+# One shared client for the whole process; its keep-alive pool is sized so
+# every analyzer worker thread can hold a warm connection, and requests
+# fail after a minute instead of the SDK's 10-minute default.
+client = Anthropic(
+    max_retries=ANTHROPIC_MAX_RETRIES,
+    http_client=DefaultHttpxClient(
+        limits=_PoolLimits(
+            max_connections=ANALYZER_CONCURRENCY * 2,
+            max_keepalive_connections=ANALYZER_CONCURRENCY
+        ),
+        timeout=Timeout(60.0, connect=10.0)
+    )
+)
 
 # System prompt - tells Claude how to behave
 SYSTEM_PROMPT = """You are a defense news editor filtering content from DVIDS (Defense Visual Information Distribution Service) for a newsroom.
@@ -57,116 +121,341 @@ def load_items_to_analyze():
         print(f"ERROR: {CURRENT_ITEMS_FILE} not found. Run scraper.py first.")
         return None
 
-    with open(CURRENT_ITEMS_FILE, 'r') as f:
-        data = json.load(f)
-
+    data = jsonio.read_json(CURRENT_ITEMS_FILE)
     return data.get('items', [])
 
 
-def analyze_item_with_claude(item):
-    """Send an item to Claude for analysis."""
+def _cache_key(item):
+    """Hash the item fields that determine its analysis."""
+    content = f"{item['link']}|{item['title']}|{item['description']}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _get_cache_db():
+    """Open the analysis cache, creating it and expiring old rows on first use."""
+    global _cache_db
+    if _cache_db is None:
+        ANALYSIS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(ANALYSIS_CACHE_FILE, check_same_thread=False)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT,
+                prompt_version TEXT,
+                analysis TEXT,
+                created_at INTEGER,
+                PRIMARY KEY (key, prompt_version)
+            )
+        """)
+        db.execute(
+            "DELETE FROM analyses WHERE created_at < ?",
+            (int(time.time()) - ANALYSIS_CACHE_TTL_SECONDS,)
+        )
+        db.commit()
+        _cache_db = db
+    return _cache_db
+
+
+def load_cached_analysis(item):
+    """Return a previously stored analysis for this item, or None."""
+    try:
+        with _cache_db_lock:
+            row = _get_cache_db().execute(
+                "SELECT analysis FROM analyses "
+                "WHERE key = ? AND prompt_version = ? AND created_at >= ?",
+                (_cache_key(item), PROMPT_VERSION,
+                 int(time.time()) - ANALYSIS_CACHE_TTL_SECONDS)
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"  Warning: Could not read analysis cache: {e}")
+        return None
 
-    # Build a prompt for this specific item
-    item_text = f"""
-Item Type: {item['type'].upper()}
-Title: {item['title']}
-Author: {item['author']}
-Published: {item['published']}
-Link: {item['link']}
+    return jsonio.loads(row[0]) if row else None
 
-Description: {item['description']}
-"""
 
+def save_cached_analysis(item, analysis):
+    """Store an analysis so reruns over the same item skip the API call."""
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=300,
-            system=SYSTEM_PROMPT,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Analyze this defense news item:\n{item_text}"
-                }
-            ]
-        )
+        with _cache_db_lock:
+            db = _get_cache_db()
+            db.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)",
+                (_cache_key(item), PROMPT_VERSION, jsonio.dumps(analysis).decode('utf-8'), int(time.time()))
+            )
+            db.commit()
+    except sqlite3.Error as e:
+        print(f"  Warning: Could not write analysis cache: {e}")
+
+
+def _build_request_params(item):
+    """Build the Messages API parameters for analyzing a single item."""
+    # Compact item text: Claude doesn't follow links, and the verdict rarely
+    # depends on more than the opening of the description
+    item_text = f"{item['type'].upper()} | {item['title']}\n{item['description'][:MAX_DESCRIPTION_CHARS]}"
+
+    return {
+        "model": MODEL,
+        "max_tokens": MAX_TOKENS,
+        # Cache breakpoint: the system prompt is identical for every item, so
+        # calls within the cache TTL bill it at the cache-read rate
+        "system": [
+            {
+                "type": "text",
+                "text": SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"}
+            }
+        ],
+        "messages": [
+            {
+                "role": "user",
+                "content": f"Analyze this defense news item:\n{item_text}"
+            }
+        ]
+    }
 
-        # Parse Claude's response
-        response_text = message.content[0].text
 
-        # Try to extract JSON from response
-        try:
-            # If Claude returns valid JSON, parse it
-            analysis = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks (```json ... ```)
-            import re
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-            if json_match:
-                try:
-                    analysis = json.loads(json_match.group(1))
-                except json.JSONDecodeError:
-                    # Fallback if still can't parse
-                    analysis = {
-                        "newsworthy": False,
-                        "score": 1,
-                        "summary": "Could not parse analysis",
-                        "why": "Error analyzing item"
-                    }
-            else:
-                # Fallback if response isn't JSON or code block
-                analysis = {
-                    "newsworthy": False,
-                    "score": 1,
-                    "summary": "Could not parse analysis",
-                    "why": "Error analyzing item"
-                }
+def _extract_json(text):
+    """
+    Parse the first JSON object in Claude's response, or None if there isn't one.
+
+    Handles bare JSON as well as JSON wrapped in prose or ```json fences by
+    decoding from the first '{' and ignoring whatever follows the object.
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+
+    try:
+        obj, _ = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+
+    return obj if isinstance(obj, dict) else None
+
+
+def _unparsed_analysis():
+    """Analysis used when Claude's response could not be parsed."""
+    return {
+        "newsworthy": False,
+        "score": 1,
+        "summary": "Could not parse analysis",
+        "why": "Error analyzing item"
+    }
+
+
+def _unavailable_analysis(error):
+    """Analysis used when Claude could not be reached for an item."""
+    return {
+        "newsworthy": True,
+        "score": 7,
+        "summary": "Could not analyze with Claude (API connection issue)",
+        "why": f"Analysis unavailable - falling back to keyword matching only. Error: {error}"
+    }
+
+
+def _record_cache_usage(usage):
+    """Add a response's prompt cache token counts to the run totals."""
+    if usage is None:
+        return
+    with _cache_stats_lock:
+        cache_stats["read"] += getattr(usage, 'cache_read_input_tokens', 0) or 0
+        cache_stats["created"] += getattr(usage, 'cache_creation_input_tokens', 0) or 0
+
+
+def _print_cache_stats():
+    """Show how much of the run's input was served from the prompt cache."""
+    print(f"\nPrompt cache: {cache_stats['read']} tokens read, "
+          f"{cache_stats['created']} tokens written")
+
+
+def _to_analyzed_item(item, analysis):
+    """Combine original item with its analysis."""
+    return {
+        **item,
+        "analysis": analysis,
+        "analyzed_at": datetime.now().isoformat()
+    }
 
-        return analysis
+
+def _print_result(position, total, item, analysis):
+    """Show the score for an analyzed item."""
+    score = analysis.get('score', 0)
+    newsworthy = analysis.get('newsworthy', False)
+    emoji = "⭐" if newsworthy else "○"
+    print(f"[{position}/{total}] {item['type'].upper()}: {item['title'][:50]}... → {emoji} Score: {score}/10")
+
+
+def _analysis_from_response(item, response_text):
+    """Parse a response and cache the analysis if it parsed cleanly."""
+    analysis = _extract_json(response_text)
+    if analysis is None:
+        return _unparsed_analysis()
+
+    save_cached_analysis(item, analysis)
+    return analysis
+
+
+def analyze_item_with_claude(item):
+    """Send an item to Claude for analysis (or reuse a cached analysis)."""
+    cached = load_cached_analysis(item)
+    if cached is not None:
+        return cached
+
+    try:
+        options = LATENCY_OPTIMIZED_OPTIONS if LATENCY_OPTIMIZED else {}
+        message = client.messages.create(**_build_request_params(item), **options)
+        _record_cache_usage(message.usage)
+
+        # Parse Claude's response
+        return _analysis_from_response(item, message.content[0].text)
 
     except Exception as e:
         print(f"  ERROR analyzing item: {e}")
-        return {
-            "newsworthy": True,
-            "score": 7,
-            "summary": "Could not analyze with Claude (API connection issue)",
-            "why": f"Analysis unavailable - falling back to keyword matching only. Error: {str(e)}"
-        }
+        return _unavailable_analysis(str(e))
 
 
-def analyze_all_items(items):
-    """Analyze all items using Claude."""
-    analyzed = []
+def analyze_all_items(items, sync=None):
+    """
+    Analyze all items using Claude.
+
+    Large runs are submitted as a single Message Batches job; small runs
+    (or sync=True) send one request per item through a bounded thread pool.
+    Callers that can't wait hours for a batch (the polling pipeline) must
+    pass sync=True. If the batch can't be submitted, falls back to per-item
+    requests.
+    """
+    if sync is None:
+        sync = len(items) < BATCH_MIN_ITEMS
+
+    if not sync:
+        try:
+            return analyze_all_items_batch(items)
+        except Exception as e:
+            print(f"  ERROR running batch analysis: {e}")
+            print("  Falling back to one request per item...")
+
+    cache_stats.update(read=0, created=0)
 
     print("\n" + "="*70)
     print("DVIDSHUB CONTENT ANALYZER")
     print("="*70)
-    print(f"Analyzing {len(items)} items with Claude...\n")
+    print(f"Analyzing {len(items)} items with Claude "
+          f"({ANALYZER_CONCURRENCY} requests at a time)...\n")
+
+    # Requests are pure network I/O, so overlap them in a bounded pool and
+    # put results back in input order by index
+    analyzed = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=ANALYZER_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(analyze_item_with_claude, item): i
+            for i, item in enumerate(items)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            analysis = future.result()
+            analyzed[i] = _to_analyzed_item(items[i], analysis)
+
+            # Show result
+            _print_result(done, len(items), items[i], analysis)
 
-    for i, item in enumerate(items, 1):
-        print(f"[{i}/{len(items)}] {item['type'].upper()}: {item['title'][:50]}...", end=" → ")
+    _print_cache_stats()
+    return analyzed
 
-        analysis = analyze_item_with_claude(item)
 
-        # Combine original item with analysis
-        analyzed_item = {
-            **item,
-            "analysis": analysis,
-            "analyzed_at": datetime.now().isoformat()
-        }
+def _run_batch(requests, items):
+    """
+    Submit a Message Batches job and return analyses keyed by custom_id.
+
+    Polls until the batch ends or BATCH_TIMEOUT_SECONDS pass, in which case
+    the batch is cancelled. Once the batch is submitted it is billed, so
+    polling errors and timeouts return whatever results were collected
+    instead of raising (which would make the caller re-analyze every item).
+    """
+    batch = client.messages.batches.create(requests=requests)
+    print(f"  Batch {batch.id} submitted")
+
+    analyses = {}
+    deadline = time.monotonic() + BATCH_TIMEOUT_SECONDS
+    delay = BATCH_POLL_INITIAL_SECONDS
+    try:
+        while batch.processing_status != "ended":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"  Batch {batch.id} not finished after {BATCH_TIMEOUT_SECONDS}s, cancelling")
+                client.messages.batches.cancel(batch.id)
+                return analyses
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+            batch = client.messages.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            print(f"  Batch {batch.processing_status}: {counts.processing} processing, "
+                  f"{counts.succeeded} succeeded, {counts.errored} errored")
+
+        # Results stream back as JSONL in arbitrary order
+        for entry in client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                _record_cache_usage(entry.result.message.usage)
+                item = items[int(entry.custom_id.split('-')[1])]
+                analyses[entry.custom_id] = _analysis_from_response(
+                    item, entry.result.message.content[0].text
+                )
+            elif entry.result.type == "errored":
+                analyses[entry.custom_id] = _unavailable_analysis(entry.result.error)
+            else:
+                analyses[entry.custom_id] = _unavailable_analysis(f"batch request {entry.result.type}")
 
-        analyzed.append(analyzed_item)
+    except Exception as e:
+        print(f"  ERROR waiting for batch {batch.id}: {e}")
+
+    return analyses
+
+
+def analyze_all_items_batch(items):
+    """
+    Analyze all items with a single Message Batches API job.
 
-        # Show result
-        score = analysis.get('score', 0)
-        newsworthy = analysis.get('newsworthy', False)
-        emoji = "⭐" if newsworthy else "○"
-        print(f"{emoji} Score: {score}/10")
+    Submits one request per uncached item, polls with exponential backoff
+    until the batch has ended (or BATCH_TIMEOUT_SECONDS pass), then matches
+    results back to items by custom_id.
+    """
+    print("\n" + "="*70)
+    print("DVIDSHUB CONTENT ANALYZER (BATCH)")
+    print("="*70)
+    print(f"Analyzing {len(items)} items with Claude as one batch...\n")
+
+    # Items analyzed on a previous run are answered from the cache
+    analyses = {}
+    for i, item in enumerate(items):
+        cached = load_cached_analysis(item)
+        if cached is not None:
+            analyses[f"item-{i}"] = cached
+
+    # custom_id must be short and alphanumeric, so use the item's position
+    # rather than its GUID (DVIDS GUIDs are URLs)
+    requests = [
+        {"custom_id": f"item-{i}", "params": _build_request_params(item)}
+        for i, item in enumerate(items)
+        if f"item-{i}" not in analyses
+    ]
+    cache_stats.update(read=0, created=0)
+
+    if requests:
+        print(f"  {len(analyses)} cached, submitting {len(requests)} requests")
+        analyses.update(_run_batch(requests, items))
+    else:
+        print(f"  All {len(items)} items found in analysis cache")
+
+    analyzed = []
+    for i, item in enumerate(items):
+        analysis = analyses.get(f"item-{i}") or _unavailable_analysis("missing from batch results")
+        analyzed.append(_to_analyzed_item(item, analysis))
+        _print_result(i + 1, len(items), item, analysis)
 
+    _print_cache_stats()
     return analyzed
 
 
-def save_analyzed_items(analyzed_items):
-    """Save analyzed items to JSON."""
+def save_analyzed_items(analyzed_items, pretty=False):
+    """Save analyzed items to JSON (compact unless pretty=True)."""
     output = {
         "last_updated": datetime.now().isoformat(),
         "total_items": len(analyzed_items),
@@ -174,8 +463,7 @@ def save_analyzed_items(analyzed_items):
         "items": analyzed_items
     }
 
-    with open(ANALYZED_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+    jsonio.write_json_atomic(ANALYZED_FILE, output, pretty=pretty)
 
     print(f"\nSaved {len(analyzed_items)} analyzed items to {ANALYZED_FILE}")
 
@@ -191,11 +479,12 @@ def main():
 
         print(f"Loaded {len(items)} items from scraper output")
 
-        # Analyze with Claude
-        analyzed_items = analyze_all_items(items)
+        # Analyze with Claude (--sync forces one request per item)
+        sync = True if '--sync' in sys.argv else None
+        analyzed_items = analyze_all_items(items, sync=sync)
 
-        # Save results
-        save_analyzed_items(analyzed_items)
+        # Save results (--pretty indents the JSON for reading by hand)
+        save_analyzed_items(analyzed_items, pretty='--pretty' in sys.argv)
 
         print("\n" + "="*70)
         print("Analysis complete!")
@@ -66,10 +66,15 @@ def index():
     """Display all topics with statistics."""
     topics = list_active_topics()
 
-    # Add stats to each topic
-    for topic in topics:
-        topic['sheet_url'] = get_topic_sheet_url(topic)
-        topic['has_slack'] = bool(topic.get('slack_webhook'))
+    # Add stats to each topic (topics are read-only, so build display copies)
+    topics = [
+        dict(
+            topic,
+            sheet_url=get_topic_sheet_url(topic),
+            has_slack=bool(topic.get('slack_webhook'))
+        )
+        for topic in topics
+    ]
 
     return render_template('index.html', topics=topics)
 
@@ -214,7 +219,7 @@ def edit_topic_route(topic_id):
             return redirect(url_for('edit_topic_route', topic_id=topic_id))
 
     # GET request - show form with current values
-    topic['sheet_url'] = get_topic_sheet_url(topic)
+    topic = dict(topic, sheet_url=get_topic_sheet_url(topic))
     return render_template('edit_topic.html', topic=topic)
 
 
@@ -0,0 +1,78 @@
+"""
+JSON file helpers shared by the pipeline's state and output files.
+
+Serialization uses orjson (C-accelerated) when it is installed and falls
+back to the standard library json module otherwise. Writes go to a
+temporary file that is flushed to disk and then renamed over the target,
+so a crash or power loss mid-write never leaves a truncated file for the
+next run to read.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files at least this large are parsed straight from a memory map
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to JSON bytes (compact unless pretty=True)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    if pretty:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Large files are memory-mapped and handed to orjson as a buffer, so the
+    raw bytes are paged in by the OS instead of being copied into memory
+    alongside the parsed result.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if orjson is None or size < MMAP_THRESHOLD_BYTES:
+            return loads(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def write_json_atomic(path: Path, obj: Any, pretty: bool = False) -> None:
+    """
+    Write obj as JSON to path, atomically replacing any existing file.
+
+    Args:
+        path: Destination file
+        obj: JSON-serializable object
+        pretty: Indent the output for humans (compact by default)
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(obj, pretty=pretty))
+        f.flush()
+        # Make sure the data is on disk before the rename makes it visible
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
@@ -5,27 +5,48 @@ Matches analyzed DVIDS items against topic keywords to determine
 which topics an item belongs to.
 """
 
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
+import ahocorasick
 
-def matches_topic(item: Dict, keywords: List[str]) -> bool:
-    """
-    Check if an item matches ANY keyword from a topic.
+# Item key holding the memoized lowercase text that keywords are matched against
+SEARCHABLE_KEY = '_searchable_lc'
 
-    Performs case-insensitive substring matching on:
-    - title
-    - description
-    - analysis.summary
 
-    Args:
-        item: Analyzed item dict with title, description, analysis
-        keywords: List of lowercase keywords to match
+@lru_cache(maxsize=256)
+def _build_automaton(keywords: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """
+    Compile lowercase keywords into an Aho-Corasick automaton.
 
-    Returns:
-        True if item matches any keyword
+    The automaton finds any of the keywords in a single pass over the text,
+    regardless of how many keywords a topic has. Cached per keyword set.
     """
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+def _topic_automaton(keywords: List[str]) -> Optional[ahocorasick.Automaton]:
+    """Get the automaton for a topic's keywords, or None if it has none."""
+    keywords = tuple(k.lower() for k in keywords if k)
     if not keywords:
-        return False
+        return None
+    return _build_automaton(keywords)
+
+
+def _searchable_text(item: Dict) -> str:
+    """
+    Get the lowercase text to match keywords against, built once per item.
+
+    Combines title, description and analysis.summary, and memoizes the
+    result on the item so matching it against many topics reuses it.
+    """
+    text = item.get(SEARCHABLE_KEY)
+    if text is not None:
+        return text
 
     # Build searchable text from multiple fields
     searchable_text = ""
@@ -40,14 +61,32 @@ def matches_topic(item: Dict, keywords: List[str]) -> bool:
         searchable_text += item['analysis']['summary'] + " "
 
     # Normalize: lowercase and remove extra whitespace
-    searchable_text = searchable_text.lower().strip()
+    text = searchable_text.lower().strip()
+    item[SEARCHABLE_KEY] = text
+    return text
 
-    # Check if any keyword appears in the searchable text
-    for keyword in keywords:
-        if keyword.lower() in searchable_text:
-            return True
 
-    return False
+def matches_topic(item: Dict, keywords: List[str]) -> bool:
+    """
+    Check if an item matches ANY keyword from a topic.
+
+    Performs case-insensitive substring matching on:
+    - title
+    - description
+    - analysis.summary
+
+    Args:
+        item: Analyzed item dict with title, description, analysis
+        keywords: List of lowercase keywords to match
+
+    Returns:
+        True if item matches any keyword
+    """
+    automaton = _topic_automaton(keywords)
+    if automaton is None:
+        return False
+
+    return next(automaton.iter(_searchable_text(item)), None) is not None
 
 
 def filter_items_by_topic(items: List[Dict], topic: Dict) -> List[Dict]:
@@ -70,20 +109,53 @@ def filter_items_by_topic(items: List[Dict], topic: Dict) -> List[Dict]:
     matching = []
 
     for item in items:
-        # Must match keywords
-        if not matches_topic(item, keywords):
-            continue
-
-        # Must meet score threshold
+        # Must meet score threshold (checked first: it's a cheap integer
+        # compare and rejects most items before any string matching)
         score = item.get('analysis', {}).get('score', 0)
         if score < score_threshold:
             continue
 
+        # Must match keywords
+        if not matches_topic(item, keywords):
+            continue
+
         matching.append(item)
 
     return matching
 
 
+def prefilter_items_for_topics(items: List[Dict], topics: List[Dict]) -> List[Dict]:
+    """
+    Keep only items whose title or description contains a keyword from any topic.
+
+    Runs before analysis, so items no topic could match are never sent to
+    Claude. The union of all topics' keywords is compiled into one cached
+    automaton and each item is scanned once. The text is not memoized on
+    the item: the post-analysis text also includes the summary.
+
+    Note that an item matching a topic only through its analysis summary is
+    dropped here; those are rare, since summaries restate the item itself.
+
+    Args:
+        items: Scraped (not yet analyzed) items
+        topics: Active topics
+
+    Returns:
+        Items that may match at least one topic, in input order
+    """
+    keywords = sorted({k for topic in topics for k in topic.get('keywords', [])})
+    automaton = _topic_automaton(keywords)
+    if automaton is None:
+        return []
+
+    matching = []
+    for item in items:
+        text = f"{item.get('title') or ''} {item.get('description') or ''}".lower()
+        if next(automaton.iter(text), None) is not None:
+            matching.append(item)
+    return matching
+
+
 def get_matching_topics(item: Dict, topics: List[Dict]) -> List[Dict]:
     """
     Find all topics that match a given item.
@@ -124,20 +196,38 @@ def get_topic_statistics(items: List[Dict], topics: List[Dict]) -> Dict:
         Dict with statistics per topic
     """
     stats = {}
+    checks = []
 
     for topic in topics:
-        topic_id = topic['id']
-        matching = filter_items_by_topic(items, topic)
-
-        stats[topic_id] = {
+        topic_stats = {
             'name': topic['name'],
-            'match_count': len(matching),
-            'high_priority': sum(
-                1 for item in matching
-                if item.get('analysis', {}).get('score', 0) >= 8
-            ),
+            'match_count': 0,
+            'high_priority': 0,
             'keywords': topic['keywords']
         }
+        stats[topic['id']] = topic_stats
+
+        automaton = _topic_automaton(topic['keywords'])
+        if automaton is not None:
+            checks.append((topic_stats, topic.get('score_threshold', 5), automaton))
+
+    # Single pass over items: each item's text is built at most once and
+    # tested against every topic it scores high enough for
+    for item in items:
+        score = item.get('analysis', {}).get('score', 0)
+        text = None
+
+        for topic_stats, score_threshold, automaton in checks:
+            if score < score_threshold:
+                continue
+
+            if text is None:
+                text = _searchable_text(item)
+
+            if next(automaton.iter(text), None) is not None:
+                topic_stats['match_count'] += 1
+                if score >= 8:
+                    topic_stats['high_priority'] += 1
 
     return stats
 
@@ -1,25 +1,154 @@
 """Notifier module for managing output integrations and state tracking."""
 
-import json
+import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
+from jsonio import dumps, loads, read_json, write_json_atomic
+
+log = logging.getLogger(__name__)
+
 STATE_FILE = Path("data") / ".notification_state.json"
 
+# Marks made since the last snapshot, one JSON event per line. Appending
+# here costs O(new GUIDs) per poll; save_notification_state folds the log
+# into a fresh snapshot and truncates it.
+STATE_LOG_FILE = Path("data") / ".notification_state.log.jsonl"
+_state_log_lock = threading.Lock()
+
+# Set when marks exist that the snapshot doesn't include yet (guarded by
+# _state_log_lock); lets save_notification_state skip no-op snapshots
+_unsaved_changes = False
+
+# compact_notification_state folds the log into a snapshot once it grows
+# past this size or the last snapshot is older than this many seconds
+STATE_LOG_MAX_BYTES = int(os.getenv('STATE_LOG_MAX_BYTES', 1024 * 1024))
+STATE_SNAPSHOT_MAX_SECONDS = int(os.getenv('STATE_SNAPSHOT_MAX_SECONDS', 60 * 60))
+_last_snapshot = time.monotonic()
+
+# GUID lists tracked in state (globally and per topic)
+GUID_KEYS = ("slack_sent", "sheets_logged")
+
+# Maximum GUIDs remembered per list; the least recently marked are
+# forgotten first. RSS feeds only republish recent items, so old GUIDs
+# never come back.
+MAX_TRACKED_GUIDS = int(os.getenv('STATE_MAX_GUIDS', 50000))
+
+
+def _index_guids(container, create=False):
+    """
+    Convert a container's GUID lists into LRU-ordered dicts.
+
+    On disk the GUIDs are JSON lists in LRU order; in memory an OrderedDict
+    gives O(1) membership while keeping the order needed to evict the least
+    recently marked entries. With create=True, missing lists are added.
+    """
+    for key in GUID_KEYS:
+        if key in container or create:
+            container[key] = OrderedDict.fromkeys(container.get(key, ()))
+
+
+def _add_guid(guids, guid):
+    """
+    Add or refresh a GUID in an LRU GUID dict, evicting past the cap.
+
+    The mark_* functions log every call, refreshes included, so replaying
+    the log after a restart reproduces the same eviction order.
+    """
+    if guid in guids:
+        guids.move_to_end(guid)
+        return
+
+    guids[guid] = None
+    if len(guids) > MAX_TRACKED_GUIDS:
+        guids.popitem(last=False)
+
+
+def _append_event(op, guid, topic_id=None):
+    """Append a single mark to the state log (written, but not fsynced)."""
+    line = dumps({"op": op, "topic": topic_id, "guid": guid}) + b"\n"
+
+    global _unsaved_changes
+    with _state_log_lock:
+        STATE_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(STATE_LOG_FILE, 'ab') as f:
+            f.write(line)
+        _unsaved_changes = True
+
+
+def _replay_event_log(state):
+    """Apply marks logged since the last snapshot to a loaded state."""
+    if not STATE_LOG_FILE.exists():
+        return
+
+    replayed = skipped = 0
+    with open(STATE_LOG_FILE, 'rb') as f:
+        for line in f:
+            try:
+                event = loads(line)
+            except ValueError:
+                # Partial line from a crash mid-append
+                skipped += 1
+                continue
+
+            if event.get("op") not in GUID_KEYS:
+                continue
+
+            if event.get("topic") is None:
+                container = state
+            else:
+                container = _get_or_create_topic_state(event["topic"], state)
+            _add_guid(container.setdefault(event["op"], OrderedDict()), event["guid"])
+            replayed += 1
+
+    log.info("✓ Replayed %d state log event(s)", replayed)
+    if skipped:
+        log.warning("⚠ Skipped %d unreadable state log line(s)", skipped)
+
+
+def _serializable_state(state):
+    """Copy of state with in-memory GUID dicts turned back into JSON lists."""
+    output = {
+        key: list(value) if key in GUID_KEYS else value
+        for key, value in state.items()
+    }
+    output["topics"] = {
+        topic_id: {
+            key: list(value) if key in GUID_KEYS else value
+            for key, value in topic_state.items()
+        }
+        for topic_id, topic_state in state.get("topics", {}).items()
+    }
+    return output
+
 
 def load_notification_state():
-    """Load notification state from file, or create new if doesn't exist."""
+    """
+    Load notification state from file, or create new if doesn't exist.
+
+    Reads the last snapshot, then replays marks logged since it was taken.
+    """
     if STATE_FILE.exists():
-        with open(STATE_FILE) as f:
-            state = json.load(f)
-            # Auto-migrate old format to new format
-            return _migrate_state_format(state)
+        state = read_json(STATE_FILE)
 
-    return {
-        "topics": {},
-        "last_updated": datetime.now().isoformat()
-    }
+        # Auto-migrate old format to new format
+        state = _migrate_state_format(state)
+
+        _index_guids(state)
+        for topic_state in state["topics"].values():
+            _index_guids(topic_state, create=True)
+    else:
+        state = {
+            "topics": {},
+            "last_updated": datetime.now().isoformat()
+        }
+
+    _replay_event_log(state)
+    return state
 
 
 def _migrate_state_format(state):
@@ -62,42 +191,78 @@ def _migrate_state_format(state):
 
 
 def save_notification_state(state):
-    """Save notification state to file."""
-    state["last_updated"] = datetime.now().isoformat()
+    """
+    Save a full snapshot of notification state and compact the state log.
 
-    # Create data directory if needed
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    Marks are appended to the log as they happen, so this only needs to run
+    periodically and on shutdown. The appends aren't fsynced: they survive
+    a process crash or restart, but marks since the last snapshot can be
+    lost if the machine itself goes down. It does nothing if no marks were
+    made since the last snapshot.
+    """
+    global _unsaved_changes, _last_snapshot
+    with _state_log_lock:
+        if not _unsaved_changes and STATE_FILE.exists() and not STATE_LOG_FILE.exists():
+            return
+
+        state["last_updated"] = datetime.now().isoformat()
+
+        # Create data directory if needed
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+        write_json_atomic(STATE_FILE, _serializable_state(state))
+
+        # Everything in the log is now in the snapshot
+        STATE_LOG_FILE.unlink(missing_ok=True)
+        _unsaved_changes = False
+        _last_snapshot = time.monotonic()
+
+
+def compact_notification_state(state):
+    """
+    Snapshot state if the state log is due for compaction.
+
+    The log is due once it reaches STATE_LOG_MAX_BYTES or the last snapshot
+    is more than STATE_SNAPSHOT_MAX_SECONDS old. Cheap enough to call on
+    every poll.
+
+    Returns:
+        True if a snapshot was written
+    """
+    try:
+        log_bytes = STATE_LOG_FILE.stat().st_size
+    except FileNotFoundError:
+        return False
+
+    if (log_bytes < STATE_LOG_MAX_BYTES
+            and time.monotonic() - _last_snapshot < STATE_SNAPSHOT_MAX_SECONDS):
+        return False
+
+    save_notification_state(state)
+    log.info("✓ Compacted %d byte state log into snapshot", log_bytes)
+    return True
 
 
 def is_slack_sent(guid, state):
     """Check if a GUID has already been sent to Slack."""
-    return guid in state.get("slack_sent", [])
+    return guid in state.get("slack_sent", ())
 
 
 def mark_slack_sent(guid, state):
     """Mark a GUID as sent to Slack."""
-    if "slack_sent" not in state:
-        state["slack_sent"] = []
-
-    if guid not in state["slack_sent"]:
-        state["slack_sent"].append(guid)
+    _add_guid(state.setdefault("slack_sent", OrderedDict()), guid)
+    _append_event("slack_sent", guid)
 
 
 def is_sheets_logged(guid, state):
     """Check if a GUID has already been logged to Google Sheets."""
-    return guid in state.get("sheets_logged", [])
+    return guid in state.get("sheets_logged", ())
 
 
 def mark_sheets_logged(guid, state):
     """Mark a GUID as logged to Google Sheets."""
-    if "sheets_logged" not in state:
-        state["sheets_logged"] = []
-
-    if guid not in state["sheets_logged"]:
-        state["sheets_logged"].append(guid)
+    _add_guid(state.setdefault("sheets_logged", OrderedDict()), guid)
+    _append_event("sheets_logged", guid)
 
 
 # ============================================================================
@@ -106,50 +271,42 @@ def mark_sheets_logged(guid, state):
 
 def _get_or_create_topic_state(topic_id, state):
     """Get or create state dict for a topic."""
-    if "topics" not in state:
-        state["topics"] = {}
+    topics = state.setdefault("topics", {})
 
-    if topic_id not in state["topics"]:
-        state["topics"][topic_id] = {
-            "slack_sent": [],
-            "sheets_logged": []
+    topic_state = topics.get(topic_id)
+    if topic_state is None:
+        topic_state = topics[topic_id] = {
+            "slack_sent": OrderedDict(),
+            "sheets_logged": OrderedDict()
         }
 
-    return state["topics"][topic_id]
+    return topic_state
 
 
 def is_topic_slack_sent(topic_id, guid, state):
     """Check if a GUID has been sent to Slack for a specific topic."""
     topic_state = _get_or_create_topic_state(topic_id, state)
-    return guid in topic_state.get("slack_sent", [])
+    return guid in topic_state.get("slack_sent", ())
 
 
 def mark_topic_slack_sent(topic_id, guid, state):
     """Mark a GUID as sent to Slack for a specific topic."""
     topic_state = _get_or_create_topic_state(topic_id, state)
-
-    if "slack_sent" not in topic_state:
-        topic_state["slack_sent"] = []
-
-    if guid not in topic_state["slack_sent"]:
-        topic_state["slack_sent"].append(guid)
+    _add_guid(topic_state.setdefault("slack_sent", OrderedDict()), guid)
+    _append_event("slack_sent", guid, topic_id)
 
 
 def is_topic_sheets_logged(topic_id, guid, state):
     """Check if a GUID has been logged to Google Sheets for a specific topic."""
     topic_state = _get_or_create_topic_state(topic_id, state)
-    return guid in topic_state.get("sheets_logged", [])
+    return guid in topic_state.get("sheets_logged", ())
 
 
 def mark_topic_sheets_logged(topic_id, guid, state):
     """Mark a GUID as logged to Google Sheets for a specific topic."""
     topic_state = _get_or_create_topic_state(topic_id, state)
-
-    if "sheets_logged" not in topic_state:
-        topic_state["sheets_logged"] = []
-
-    if guid not in topic_state["sheets_logged"]:
-        topic_state["sheets_logged"].append(guid)
+    _add_guid(topic_state.setdefault("sheets_logged", OrderedDict()), guid)
+    _append_event("sheets_logged", guid, topic_id)
 
 
 def get_topic_state(topic_id, state):
@@ -2,13 +2,47 @@
 
 import gspread
 from google.oauth2.service_account import Credentials
+from functools import lru_cache
 from typing import Dict, Any, List
+import logging
 import os
+import threading
 
 
+log = logging.getLogger(__name__)
+
 SHEETS_SCOPE = ['https://www.googleapis.com/auth/spreadsheets']
 SHEET_HEADERS = ['Timestamp', 'GUID', 'Type', 'Title', 'Score', 'Newsworthy', 'Summary', 'Why', 'Link']
 
+# Worksheet handles by (spreadsheet_id, worksheet_name), so repeated lookups
+# skip gspread's metadata fetch
+_worksheet_cache: Dict[tuple, gspread.Worksheet] = {}
+_worksheet_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _authorized_client(credentials_path: str) -> gspread.Client:
+    """Load service account credentials and authorize once per path."""
+    creds = Credentials.from_service_account_file(
+        credentials_path,
+        scopes=SHEETS_SCOPE
+    )
+    return gspread.authorize(creds)
+
+
+@lru_cache(maxsize=16)
+def _open_spreadsheet(client: gspread.Client, spreadsheet_id: str) -> gspread.Spreadsheet:
+    """Open a spreadsheet by key once per client."""
+    return client.open_by_key(spreadsheet_id)
+
+
+def _forget_worksheet(worksheet: gspread.Worksheet) -> None:
+    """Drop a cached worksheet handle (e.g. after it failed a write)."""
+    with _worksheet_cache_lock:
+        for key, cached in list(_worksheet_cache.items()):
+            if cached is worksheet:
+                del _worksheet_cache[key]
+
 
 def init_sheets_client(credentials_path: str) -> gspread.Client:
     """
@@ -28,12 +62,9 @@ def init_sheets_client(credentials_path: str) -> gspread.Client:
         raise FileNotFoundError(f"Credentials file not found: {credentials_path}")
 
     try:
-        creds = Credentials.from_service_account_file(
-            credentials_path,
-            scopes=SHEETS_SCOPE
-        )
-        client = gspread.authorize(creds)
-        print(f"✓ Google Sheets client initialized")
+        # Credentials are parsed and authorized once per process
+        client = _authorized_client(credentials_path)
+        log.info("✓ Google Sheets client initialized")
         return client
 
     except Exception as e:
@@ -55,7 +86,7 @@ def get_or_create_sheet(client: gspread.Client, spreadsheet_id: str) -> gspread.
         Exception: If spreadsheet access fails
     """
     try:
-        spreadsheet = client.open_by_key(spreadsheet_id)
+        spreadsheet = _open_spreadsheet(client, spreadsheet_id)
         worksheet = spreadsheet.worksheet('Defense News')
 
         return worksheet
@@ -63,12 +94,12 @@ def get_or_create_sheet(client: gspread.Client, spreadsheet_id: str) -> gspread.
     except gspread.exceptions.WorksheetNotFound:
         # Worksheet doesn't exist, create it
         try:
-            spreadsheet = client.open_by_key(spreadsheet_id)
+            spreadsheet = _open_spreadsheet(client, spreadsheet_id)
             worksheet = spreadsheet.add_worksheet(title='Defense News', rows=100, cols=9)
 
             # Add headers
             worksheet.append_row(SHEET_HEADERS)
-            print(f"✓ Created new worksheet 'Defense News' with headers")
+            log.info("✓ Created new worksheet 'Defense News' with headers")
 
             return worksheet
 
@@ -82,7 +113,7 @@ def get_or_create_sheet(client: gspread.Client, spreadsheet_id: str) -> gspread.
         raise Exception(f"Failed to access Google Sheets: {e}")
 
 
-def item_to_row(item: Dict[str, Any]) -> List[str]:
+def item_to_row(item: Dict[str, Any]) -> tuple:
     """
     Convert analyzed item to a row for Google Sheets.
 
@@ -90,11 +121,11 @@ def item_to_row(item: Dict[str, Any]) -> List[str]:
         item: Analyzed news item
 
     Returns:
-        List of strings for sheet row
+        Tuple of strings for sheet row
     """
-    analysis = item.get("analysis", {})
+    analysis = item.get("analysis") or {}
 
-    row = [
+    return (
         item.get("analyzed_at", "")[:19],  # Timestamp without microseconds
         item.get("guid", ""),
         item.get("type", "").upper(),
@@ -104,9 +135,7 @@ def item_to_row(item: Dict[str, Any]) -> List[str]:
         analysis.get("summary", "")[:400],  # Key summary points
         analysis.get("why", "")[:250],  # Brief explanation
         item.get("link", "")
-    ]
-
-    return row
+    )
 
 
 def append_item_to_sheet(worksheet: gspread.Worksheet, item: Dict[str, Any]) -> bool:
@@ -122,14 +151,14 @@ def append_item_to_sheet(worksheet: gspread.Worksheet, item: Dict[str, Any]) ->
     """
     try:
         row = item_to_row(item)
-        worksheet.append_row(row)
+        worksheet.append_row(row, value_input_option='RAW')
 
         title = item.get("title", "")[:40]
-        print(f"  ✓ Logged to Sheets: {title}...")
+        log.debug("  ✓ Logged to Sheets: %s...", title)
         return True
 
     except Exception as e:
-        print(f"  ✗ Error logging to Sheets: {e}")
+        log.error("  ✗ Error logging to Sheets: %s", e)
         return False
 
 
@@ -149,13 +178,17 @@ def batch_append_items_to_sheet(worksheet: gspread.Worksheet, items: List[Dict[s
 
     try:
         rows = [item_to_row(item) for item in items]
-        worksheet.append_rows(rows)
+        # RAW: cell text is stored as-is, so Sheets never parses titles or
+        # summaries as formulas or dates
+        worksheet.append_rows(rows, value_input_option='RAW')
 
-        print(f"  ✓ Logged {len(items)} items to Sheets")
+        log.info("  ✓ Logged %d items to Sheets", len(items))
         return True
 
     except Exception as e:
-        print(f"  ✗ Error batch logging to Sheets: {e}")
+        log.error("  ✗ Error batch logging to Sheets: %s", e)
+        # The worksheet may have been deleted or renamed; look it up again next time
+        _forget_worksheet(worksheet)
         return False
 
 
@@ -182,12 +215,20 @@ def get_or_create_topic_worksheet(
     Raises:
         Exception: If spreadsheet access fails
     """
+    cache_key = (spreadsheet_id, worksheet_name)
+    with _worksheet_cache_lock:
+        worksheet = _worksheet_cache.get(cache_key)
+    if worksheet is not None:
+        return worksheet
+
     try:
-        spreadsheet = client.open_by_key(spreadsheet_id)
+        spreadsheet = _open_spreadsheet(client, spreadsheet_id)
 
         # Try to get existing worksheet
         try:
             worksheet = spreadsheet.worksheet(worksheet_name)
+            with _worksheet_cache_lock:
+                _worksheet_cache[cache_key] = worksheet
             return worksheet
         except gspread.exceptions.WorksheetNotFound:
             # Create new worksheet with headers
@@ -199,8 +240,10 @@ def get_or_create_topic_worksheet(
 
             # Add headers
             worksheet.append_row(SHEET_HEADERS)
-            print(f"✓ Created worksheet: {worksheet_name}")
+            log.info("✓ Created worksheet: %s", worksheet_name)
 
+            with _worksheet_cache_lock:
+                _worksheet_cache[cache_key] = worksheet
             return worksheet
 
     except gspread.exceptions.SpreadsheetNotFound:
@@ -210,6 +253,43 @@ def get_or_create_topic_worksheet(
         raise Exception(f"Failed to create topic worksheet '{worksheet_name}': {e}")
 
 
+def prefetch_topic_worksheets(
+    client: gspread.Client,
+    spreadsheet_id: str,
+    worksheet_names: List[str]
+) -> None:
+    """
+    Load handles for any uncached topic worksheets with a single request.
+
+    One spreadsheet metadata fetch covers every existing tab, so the
+    per-topic get_or_create_topic_worksheet calls that follow only hit the
+    API for worksheets that still need to be created.
+
+    Args:
+        client: Authenticated gspread client
+        spreadsheet_id: Google Sheets spreadsheet ID
+        worksheet_names: Worksheet names the caller is about to use
+    """
+    with _worksheet_cache_lock:
+        missing = [
+            name for name in worksheet_names
+            if (spreadsheet_id, name) not in _worksheet_cache
+        ]
+    if not missing:
+        return
+
+    try:
+        worksheets = _open_spreadsheet(client, spreadsheet_id).worksheets()
+    except Exception as e:
+        # Not fatal: get_or_create_topic_worksheet looks tabs up one by one
+        log.error("✗ Failed to prefetch worksheets: %s", e)
+        return
+
+    with _worksheet_cache_lock:
+        for worksheet in worksheets:
+            _worksheet_cache.setdefault((spreadsheet_id, worksheet.title), worksheet)
+
+
 def create_topic_sheet_on_add(client: gspread.Client, topic: Dict[str, Any]) -> bool:
     """
     Create a new worksheet for a topic immediately when user adds it.
@@ -232,5 +312,5 @@ def create_topic_sheet_on_add(client: gspread.Client, topic: Dict[str, Any]) ->
         return True
 
     except Exception as e:
-        print(f"✗ Error creating topic sheet: {e}")
+        log.error("✗ Error creating topic sheet: %s", e)
         return False
@@ -1,7 +1,53 @@
 """Slack notification integration for sending high-priority defense news alerts."""
 
+import logging
 import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+# Maximum concurrent webhook POSTs in send_slack_notifications
+SLACK_MAX_WORKERS = 8
+
+# Shared session so webhook POSTs reuse keep-alive TLS connections to
+# hooks.slack.com. Only failures where Slack can't have posted the message
+# are retried: connection errors and 429 (honoring Retry-After). A read
+# timeout or 5xx may already have been delivered, so resending it could
+# post a duplicate alert.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=SLACK_MAX_WORKERS * 2,
+    max_retries=Retry(
+        total=2,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=[429],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False
+    )
+))
+
+# Truncation limits for message fields
+TITLE_MAX_CHARS = 80
+SUMMARY_MAX_CHARS = 200
+WHY_MAX_CHARS = 150
+
+# Plain text message layout, filled in by format_slack_message
+_MESSAGE_TEMPLATE = """{header}
+*Score:* {score}/10
+
+*Title:* {title}
+
+*Summary:* {summary}
+
+*Why Newsworthy:* {why}
+
+🔗 Read More: {link}"""
 
 
 def format_slack_message(item: Dict[str, Any], topic_name: str = None) -> Dict[str, str]:
@@ -15,7 +61,7 @@ def format_slack_message(item: Dict[str, Any], topic_name: str = None) -> Dict[s
     Returns:
         Dictionary with 'text' key for Slack message
     """
-    analysis = item.get("analysis", {})
+    analysis = item.get("analysis") or {}
     score = analysis.get("score", 0)
     summary = analysis.get("summary", "No summary available")
     why = analysis.get("why", "")
@@ -24,9 +70,7 @@ def format_slack_message(item: Dict[str, Any], topic_name: str = None) -> Dict[s
     item_type = item.get("type", "unknown").upper()
 
     # Truncate long text
-    title_short = title[:80]
-    summary_short = summary[:200]
-    why_short = why[:150] + "..." if len(why) > 150 else why
+    why_short = why[:WHY_MAX_CHARS] + "..." if len(why) > WHY_MAX_CHARS else why
 
     # Build header with optional topic
     if topic_name:
@@ -34,17 +78,14 @@ def format_slack_message(item: Dict[str, Any], topic_name: str = None) -> Dict[s
     else:
         header = f"🚨 *High-Priority Defense News Alert* ({item_type})"
 
-    # Format as plain text message
-    message_text = f"""{header}
-*Score:* {score}/10
-
-*Title:* {title_short}
-
-*Summary:* {summary_short}
-
-*Why Newsworthy:* {why_short}
-
-🔗 Read More: {link}"""
+    message_text = _MESSAGE_TEMPLATE.format_map({
+        "header": header,
+        "score": score,
+        "title": title[:TITLE_MAX_CHARS],
+        "summary": summary[:SUMMARY_MAX_CHARS],
+        "why": why_short,
+        "link": link,
+    })
 
     return {"text": message_text}
 
@@ -60,9 +101,8 @@ def is_notification_worthy(item: Dict[str, Any], threshold: int = 6) -> bool:
     Returns:
         True if score >= threshold, False otherwise
     """
-    analysis = item.get("analysis", {})
-    score = analysis.get("score", 0)
-    return score >= threshold
+    analysis = item.get("analysis") or {}
+    return analysis.get("score", 0) >= threshold
 
 
 def send_slack_notification(webhook_url: str, item: Dict[str, Any], topic_name: str = None) -> bool:
@@ -79,17 +119,51 @@ def send_slack_notification(webhook_url: str, item: Dict[str, Any], topic_name:
     """
     try:
         message = format_slack_message(item, topic_name=topic_name)
-        response = requests.post(webhook_url, json=message, timeout=10)
+        response = _SESSION.post(webhook_url, json=message, timeout=10)
 
         if response.status_code == 200:
             title = item.get("title", "")[:50]
-            score = item.get("analysis", {}).get("score", 0)
-            print(f"  ✓ Slack notified: {title}... (Score: {score}/10)")
+            score = (item.get("analysis") or {}).get("score", 0)
+            log.debug("  ✓ Slack notified: %s... (Score: %s/10)", title, score)
             return True
         else:
-            print(f"  ✗ Slack notification failed: {response.status_code} - {response.text}")
+            log.error("  ✗ Slack notification failed: %s - %s", response.status_code, response.text)
             return False
 
     except Exception as e:
-        print(f"  ✗ Error sending Slack notification: {e}")
+        log.error("  ✗ Error sending Slack notification: %s", e)
         return False
+
+
+def send_slack_notifications(
+    webhook_url: str,
+    items: List[Dict[str, Any]],
+    topic_name: str = None
+) -> List[Dict[str, Any]]:
+    """
+    Send notifications for several items concurrently.
+
+    Each POST is independent and network-bound, so they run in a small
+    thread pool and total time is roughly one round trip instead of one
+    per item.
+
+    Args:
+        webhook_url: Slack incoming webhook URL
+        items: Analyzed news items to send
+        topic_name: Optional topic name to include in each message
+
+    Returns:
+        The items that were sent successfully, in input order
+    """
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(SLACK_MAX_WORKERS, len(items))) as executor:
+        results = executor.map(
+            lambda item: send_slack_notification(webhook_url, item, topic_name=topic_name),
+            items
+        )
+        sent_items = [item for item, sent in zip(items, results) if sent]
+
+    log.info("  ✓ Slack notified: %d/%d item(s)", len(sent_items), len(items))
+    return sent_items
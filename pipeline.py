@@ -7,10 +7,12 @@ and routes items to user-defined topics with dedicated Google Sheets
 and optional Slack notifications per topic.
 """
 
+import logging
+import signal
 import time
 import os
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Note: load_dotenv() removed - Railway provides environment variables directly
@@ -23,24 +25,31 @@ import keyword_matcher
 from notifiers import (
     load_notification_state,
     save_notification_state,
-    is_topic_slack_sent,
+    compact_notification_state,
+    get_topic_state,
     mark_topic_slack_sent,
-    is_topic_sheets_logged,
     mark_topic_sheets_logged,
-    initialize_topic_state,
 )
-from notifiers.slack_notifier import send_slack_notification
+from notifiers.slack_notifier import send_slack_notifications
 from notifiers.sheets_logger import (
     init_sheets_client,
     get_or_create_topic_worksheet,
-    append_item_to_sheet
+    prefetch_topic_worksheets,
+    batch_append_items_to_sheet
 )
 
+log = logging.getLogger(__name__)
+
 
 # Configuration from environment variables
 POLL_INTERVAL = int(os.getenv('POLL_INTERVAL_SECONDS', 300))
 GOOGLE_SHEETS_SPREADSHEET_ID = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID')
 GOOGLE_CREDENTIALS_PATH = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials/google_service_account.json')
+# Drop items matching no topic's keywords (title/description) before analysis.
+# Set to 0 to also analyze items that could only match through Claude's summary.
+KEYWORD_PREFILTER = os.getenv('KEYWORD_PREFILTER', '1') == '1'
+# Maximum topics processed concurrently per iteration
+TOPIC_MAX_WORKERS = int(os.getenv('TOPIC_MAX_WORKERS', 8))
 
 
 def validate_configuration():
@@ -55,26 +64,166 @@ def validate_configuration():
         errors.append("    (Upload to Railway Volumes → /app/credentials/)")
 
     if errors:
-        print("\n" + "="*70)
-        print("Configuration Validation Failed")
-        print("="*70)
+        log.error("Configuration Validation Failed")
         for error in errors:
-            print(error)
-        print("\n→ For Railway: Check project Variables/Secrets")
-        print("→ For local: Create .env file with required variables")
+            log.error(error)
+        log.info("→ For Railway: Check project Variables/Secrets")
+        log.info("→ For local: Create .env file with required variables")
         return False
 
     return True
 
 
+def needs_processing(guid, topics, state):
+    """
+    Check whether any topic still has to log or alert on a GUID.
+
+    Items every topic has already logged (and alerted on, where Slack is
+    configured) can skip Claude analysis entirely.
+    """
+    for topic in topics:
+        topic_state = get_topic_state(topic['id'], state)
+        if guid not in topic_state.get("sheets_logged", ()):
+            return True
+        if topic.get('slack_webhook') and guid not in topic_state.get("slack_sent", ()):
+            return True
+    return False
+
+
+def process_topic(topic, analyzed_items, sheets_client, state):
+    """
+    Route analyzed items to a single topic's worksheet and Slack channel.
+
+    Safe to run concurrently for different topics: it only mutates this
+    topic's GUID lists, and state log appends are serialized in notifiers.
+
+    Args:
+        topic: Topic dictionary
+        analyzed_items: Items analyzed in this iteration
+        sheets_client: Authorized gspread client
+        state: Notification state
+
+    Returns:
+        Tuple of (slack_sent_count, sheets_logged_count)
+    """
+    topic_id = topic['id']
+    topic_name = topic['name']
+    slack_sent_count = 0
+    sheets_logged_count = 0
+
+    log.info("  📌 Topic: %s", topic_name)
+
+    # Bind this topic's GUID lookups once instead of per item
+    topic_state = get_topic_state(topic_id, state)
+    slack_sent = topic_state["slack_sent"]
+    sheets_logged = topic_state["sheets_logged"]
+
+    # Filter items for this topic
+    matching_items = keyword_matcher.filter_items_by_topic(
+        analyzed_items,
+        topic
+    )
+
+    if not matching_items:
+        log.info("     → [%s] No matching items for this topic", topic_name)
+        return slack_sent_count, sheets_logged_count
+
+    log.info("     → [%s] Found %d matching item(s)", topic_name, len(matching_items))
+
+    # Get or create worksheet for this topic
+    try:
+        worksheet = get_or_create_topic_worksheet(
+            sheets_client,
+            GOOGLE_SHEETS_SPREADSHEET_ID,
+            topic['sheet_name']
+        )
+    except Exception as e:
+        log.error("     ✗ [%s] Failed to access worksheet: %s", topic_name, e)
+        return slack_sent_count, sheets_logged_count
+
+    # Partition matching items into the Sheets and Slack queues in a single
+    # pass. filter_items_by_topic already applied the topic's score
+    # threshold, so only the GUID lookups remain per item.
+    notify = bool(topic.get('slack_webhook'))
+    items_to_log = []
+    items_to_notify = []
+    for item in matching_items:
+        guid = item['guid']
+        if guid not in sheets_logged:
+            items_to_log.append(item)
+        if notify and guid not in slack_sent:
+            items_to_notify.append(item)
+
+    already_logged = len(matching_items) - len(items_to_log)
+    if already_logged:
+        log.info("     ℹ [%s] Already logged: %d item(s)", topic_name, already_logged)
+
+    # Log all new rows for this topic with a single Sheets request
+    if items_to_log and batch_append_items_to_sheet(worksheet, items_to_log):
+        for item in items_to_log:
+            mark_topic_sheets_logged(topic_id, item['guid'], state)
+        sheets_logged_count = len(items_to_log)
+
+    # Send Slack alerts concurrently
+    if items_to_notify:
+        for item in send_slack_notifications(
+            topic['slack_webhook'],
+            items_to_notify,
+            topic_name=topic_name
+        ):
+            mark_topic_slack_sent(topic_id, item['guid'], state)
+            slack_sent_count += 1
+
+    return slack_sent_count, sheets_logged_count
+
+
+def wait_for_next_poll(deadline, state):
+    """
+    Compact the notification state log if due, then sleep until the next poll.
+
+    Every iteration ends here, idle or not, so the state log can't grow
+    unbounded between snapshots.
+
+    Args:
+        deadline: time.monotonic() value at which the next poll should start
+        state: Notification state dict
+
+    Returns:
+        The deadline to schedule the following poll from. If the iteration
+        overran, this is the current time so missed polls are not run back
+        to back.
+    """
+    compact_notification_state(state)
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        log.warning("⚠ Iteration exceeded POLL_INTERVAL by %.1fs; polling again now", -remaining)
+        return time.monotonic()
+
+    log.info("⏳ Waiting %.0f seconds until next poll...", remaining)
+    time.sleep(remaining)
+    return deadline
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    """Treat SIGTERM (how Railway stops the worker) like Ctrl+C."""
+    raise KeyboardInterrupt
+
+
 def main():
     """Main continuous monitoring loop."""
-    print("\n" + "="*70)
-    print("DEFENSE NEWS PIPELINE - MULTI-TOPIC MONITORING")
-    print("="*70)
-    print(f"Poll interval: {POLL_INTERVAL} seconds")
-    print(f"Spreadsheet ID: {GOOGLE_SHEETS_SPREADSHEET_ID}")
-    print("Press Ctrl+C to stop gracefully\n")
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+    logging.basicConfig(
+        level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+        format='%(asctime)s %(message)s',
+        stream=sys.stdout
+    )
+
+    log.info("DEFENSE NEWS PIPELINE - MULTI-TOPIC MONITORING")
+    log.info("Poll interval: %d seconds", POLL_INTERVAL)
+    log.info("Spreadsheet ID: %s", GOOGLE_SHEETS_SPREADSHEET_ID)
+    log.info("Press Ctrl+C to stop gracefully")
 
     # Validate configuration
     if not validate_configuration():
@@ -83,152 +232,151 @@ def main():
     # Initialize Google Sheets
     try:
         sheets_client = init_sheets_client(GOOGLE_CREDENTIALS_PATH)
-        print(f"✓ Google Sheets client initialized\n")
+        log.info("✓ Google Sheets client initialized")
     except Exception as e:
-        print(f"✗ Failed to initialize Google Sheets: {e}")
+        log.error("✗ Failed to initialize Google Sheets: %s", e)
         sys.exit(1)
 
     # Load initial state
     state = load_notification_state()
-    print(f"✓ Loaded notification state\n")
+    log.info("✓ Loaded notification state")
 
     iteration = 0
+    # Polls are scheduled from a monotonic deadline so slow iterations
+    # don't push every later poll back
+    next_deadline = time.monotonic()
+    # Set while polls find no active topics; the feed backlog from that
+    # stretch is marked seen instead of analyzed once a topic appears
+    idle_without_topics = False
 
     try:
         while True:
             iteration += 1
-            print(f"\n{'='*70}")
-            print(f"Iteration {iteration} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print("="*70)
+            next_deadline += POLL_INTERVAL
+            log.info("Iteration %d", iteration)
 
             try:
                 # Skip work on first iteration (allows build validation to complete)
                 # Start actual work on iteration 2
                 if iteration == 1:
-                    print("\n✓ Pipeline started successfully")
-                    print("  (Skipping work on first iteration to allow build validation)")
-                    print(f"  Will start monitoring topics in {POLL_INTERVAL} seconds...\n")
-                    time.sleep(POLL_INTERVAL)
+                    log.info("✓ Pipeline started successfully")
+                    log.info("  (Skipping work on first iteration to allow build validation)")
+                    log.info("  Will start monitoring topics in %d seconds...", POLL_INTERVAL)
+                    next_deadline = wait_for_next_poll(next_deadline, state)
                     continue
 
                 # Step 0: Check if topics are configured
-                print("\n0️⃣  Loading active topics...")
+                log.info("0️⃣  Loading active topics...")
                 topics = topic_manager.list_active_topics()
 
                 if not topics:
-                    print("  ⚠ No active topics configured yet.")
-                    print("  → Add topics via the web UI, then items will be monitored")
-                    print(f"  → Next check in {POLL_INTERVAL} seconds...")
-                    time.sleep(POLL_INTERVAL)
+                    log.warning("  ⚠ No active topics configured yet.")
+                    log.info("  → Add topics via the web UI, then items will be monitored")
+                    log.info("  → Next check in %d seconds...", POLL_INTERVAL)
+                    idle_without_topics = True
+                    next_deadline = wait_for_next_poll(next_deadline, state)
                     continue
 
-                print(f"  ✓ Found {len(topics)} active topic(s)\n")
+                log.info("  ✓ Found %d active topic(s)", len(topics))
+
+                if idle_without_topics:
+                    log.info("1️⃣  First topic(s) configured: marking current feed items as seen...")
+                    warmed = scraper.warm_guid_cache()
+                    log.info("  ✓ Skipped %d backlog item(s); monitoring new items from now on", warmed)
+                    idle_without_topics = False
+                    next_deadline = wait_for_next_poll(next_deadline, state)
+                    continue
 
                 # Step 1: Scrape for new items
-                print("1️⃣  Scraping DVIDS for new items...")
-                new_items = scraper.main()
+                log.info("1️⃣  Scraping DVIDS for new items...")
+                new_items = scraper.main(save_items=False)
 
                 if not new_items:
-                    print("  No new items found. Waiting for next poll...")
-                    time.sleep(POLL_INTERVAL)
+                    log.info("  No new items found. Waiting for next poll...")
+                    next_deadline = wait_for_next_poll(next_deadline, state)
                     continue
 
-                print(f"  ✓ Found {len(new_items)} new item(s)")
+                log.info("  ✓ Found %d new item(s)", len(new_items))
+
+                # Only pay for analysis on items some topic still needs
+                pending_items = [
+                    item for item in new_items
+                    if needs_processing(item['guid'], topics, state)
+                ]
+                if len(pending_items) < len(new_items):
+                    log.info("  ✓ Skipping %d item(s) already processed for every topic",
+                             len(new_items) - len(pending_items))
+
+                # Don't pay for analysis on items no topic's keywords can match
+                if KEYWORD_PREFILTER and pending_items:
+                    candidates = keyword_matcher.prefilter_items_for_topics(pending_items, topics)
+                    if len(candidates) < len(pending_items):
+                        log.info("  ✓ Skipping %d item(s) matching no topic keywords",
+                                 len(pending_items) - len(candidates))
+                    pending_items = candidates
+
+                if not pending_items:
+                    log.info("  Nothing left to analyze. Waiting for next poll...")
+                    next_deadline = wait_for_next_poll(next_deadline, state)
+                    continue
 
                 # Step 2: Analyze new items
-                print("\n2️⃣  Analyzing items with Claude...")
-                analyzed_items = analyzer.analyze_all_items(new_items)
+                log.info("2️⃣  Analyzing items with Claude...")
+                # Alerts can't wait on a Message Batches job (up to 24h), so
+                # the worker always analyzes per item; batches are CLI-only
+                analyzed_items = analyzer.analyze_all_items(pending_items, sync=True)
 
                 # Step 3: Process each topic
-                print("\n3️⃣  Processing topics...")
+                log.info("3️⃣  Processing topics...")
                 total_slack_sent = 0
                 total_sheets_logged = 0
 
+                # Create any missing topic state up front so workers only
+                # touch their own topic's GUID lists
                 for topic in topics:
-                    topic_id = topic['id']
-                    topic_name = topic['name']
-
-                    print(f"\n  📌 Topic: {topic_name}")
-
-                    # Initialize state for this topic if needed
-                    initialize_topic_state(topic_id, state)
-
-                    # Filter items for this topic
-                    matching_items = keyword_matcher.filter_items_by_topic(
-                        analyzed_items,
-                        topic
-                    )
-
-                    if not matching_items:
-                        print(f"     → No matching items for this topic")
-                        continue
-
-                    print(f"     → Found {len(matching_items)} matching item(s)")
-
-                    # Get or create worksheet for this topic
-                    try:
-                        worksheet = get_or_create_topic_worksheet(
-                            sheets_client,
-                            GOOGLE_SHEETS_SPREADSHEET_ID,
-                            topic['sheet_name']
-                        )
-                    except Exception as e:
-                        print(f"     ✗ Failed to access worksheet: {e}")
-                        continue
-
-                    # Process each matching item
-                    for item in matching_items:
-                        guid = item['guid']
-                        score = item['analysis']['score']
-                        title = item['title'][:50]
-
-                        # Log to Google Sheets
-                        if not is_topic_sheets_logged(topic_id, guid, state):
-                            if append_item_to_sheet(worksheet, item):
-                                mark_topic_sheets_logged(topic_id, guid, state)
-                                total_sheets_logged += 1
-                        else:
-                            print(f"     ℹ Already logged: {title}...")
-
-                        # Send to Slack if configured and score meets threshold
-                        if topic.get('slack_webhook'):
-                            if score >= topic.get('score_threshold', 5):
-                                if not is_topic_slack_sent(topic_id, guid, state):
-                                    if send_slack_notification(
-                                        topic['slack_webhook'],
-                                        item,
-                                        topic_name=topic_name
-                                    ):
-                                        mark_topic_slack_sent(topic_id, guid, state)
-                                        total_slack_sent += 1
-                                else:
-                                    print(f"     ℹ Already notified in Slack: {title}...")
-
-                # Step 5: Save updated state
-                save_notification_state(state)
-                print(f"\n✓ Summary: Sent {total_slack_sent} Slack alert(s), "
-                      f"logged {total_sheets_logged} item(s) across all topics")
+                    get_topic_state(topic['id'], state)
+
+                # Resolve all topic worksheets with one metadata request
+                prefetch_topic_worksheets(
+                    sheets_client,
+                    GOOGLE_SHEETS_SPREADSHEET_ID,
+                    [topic['sheet_name'] for topic in topics]
+                )
+
+                # Topics are independent and their work is network-bound
+                # (Sheets, Slack), so run them concurrently
+                with ThreadPoolExecutor(max_workers=min(TOPIC_MAX_WORKERS, len(topics))) as executor:
+                    futures = [
+                        executor.submit(process_topic, topic, analyzed_items, sheets_client, state)
+                        for topic in topics
+                    ]
+                    for future in as_completed(futures):
+                        slack_sent_count, sheets_logged_count = future.result()
+                        total_slack_sent += slack_sent_count
+                        total_sheets_logged += sheets_logged_count
+
+                log.info("✓ Summary: Sent %d Slack alert(s), logged %d item(s) across all topics",
+                         total_slack_sent, total_sheets_logged)
 
             except KeyboardInterrupt:
-                print("\n\n⏹ Shutdown signal received. Saving state and exiting gracefully...")
+                log.info("⏹ Shutdown signal received. Saving state and exiting gracefully...")
                 save_notification_state(state)
-                print("State saved. Goodbye!")
+                log.info("State saved. Goodbye!")
                 break
 
             except Exception as e:
-                print(f"\n✗ Error in pipeline iteration: {e}")
-                import traceback
-                traceback.print_exc()
-                print(f"  Waiting 60 seconds before retry...")
+                log.exception("✗ Error in pipeline iteration: %s", e)
+                log.info("  Waiting 60 seconds before retry...")
                 time.sleep(60)
+                # Schedule polls from the retry rather than the failed iteration
+                next_deadline = time.monotonic()
                 continue
 
             # Wait for next poll
-            print(f"\n⏳ Waiting {POLL_INTERVAL} seconds until next poll...")
-            time.sleep(POLL_INTERVAL)
+            next_deadline = wait_for_next_poll(next_deadline, state)
 
     except KeyboardInterrupt:
-        print("\n\n⏹ Shutdown signal received. Exiting...")
+        log.info("⏹ Shutdown signal received. Exiting...")
         save_notification_state(state)
 
 
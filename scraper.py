@@ -1,13 +1,17 @@
 import requests
 import json
+import os
 import re
-import warnings
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Suppress the XML-as-HTML warning - we know what we're doing
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+from jsonio import read_json, write_json_atomic
 
 # ============================================================================
 # DVIDSHUB NEWS PIPELINE - Part 1: Data Collection
@@ -27,100 +31,225 @@ DATA_DIR = Path('data')
 DATA_DIR.mkdir(exist_ok=True)
 
 CURRENT_ITEMS_FILE = DATA_DIR / 'current_items.json'
-PROCESSED_FILE = DATA_DIR / '.processed_guids.json'  # Hidden file to track what we've seen
+PROCESSED_DB = DATA_DIR / 'processed.db'  # GUIDs we've already seen
+PROCESSED_FILE = DATA_DIR / '.processed_guids.json'  # Legacy JSON GUID list, migrated into PROCESSED_DB
+FEED_CACHE_FILE = DATA_DIR / '.feed_cache.json'  # ETag / Last-Modified per feed URL
+
+# Most recent GUIDs kept in PROCESSED_DB. The feeds only carry recent items,
+# so older GUIDs can't reappear and are pruned to keep the store bounded.
+PROCESSED_MAX_GUIDS = int(os.getenv('PROCESSED_MAX_GUIDS', 50000))
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+# Size of the response chunks fed to the RSS parser
+FEED_CHUNK_BYTES = 16 * 1024
+
+# Compiled once rather than per item
+_TAG_RE = re.compile(r'<[^>]+>')
+_HREF_RE = re.compile(r'href=[\'"]([^\'"]*dvidshub\.net[^\'"]*)[\'"]')
+
+# Shared session so every poll reuses keep-alive connections to dvidshub.net
+# instead of paying a TLS handshake per feed. Rate limits and transient
+# server errors are retried with backoff before a feed is given up on.
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=len(RSS_FEEDS),
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
+
+def _get_processed_db():
+    """Open the processed-GUID store, creating it (and migrating the legacy JSON list) if needed."""
+    db = sqlite3.connect(PROCESSED_DB)
+    # WAL + NORMAL sync: one cheap fsync per poll instead of a full file rewrite
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS seen (
+            guid TEXT PRIMARY KEY,
+            first_seen INTEGER
+        ) WITHOUT ROWID
+    """)
+    # Lets the prune in identify_new_items walk GUIDs by age instead of
+    # scanning and sorting the whole table
+    db.execute("CREATE INDEX IF NOT EXISTS seen_first_seen ON seen(first_seen)")
 
-def load_processed_guids():
-    """Load the list of GUIDs we've already processed."""
     if PROCESSED_FILE.exists():
         with open(PROCESSED_FILE, 'r') as f:
-            return set(json.load(f))
-    return set()
+            legacy_guids = json.load(f)
+        with db:
+            now = int(time.time())
+            db.executemany(
+                "INSERT OR IGNORE INTO seen (guid, first_seen) VALUES (?, ?)",
+                ((guid, now) for guid in legacy_guids)
+            )
+        PROCESSED_FILE.rename(PROCESSED_FILE.with_suffix('.json.migrated'))
+        print(f"  Migrated {len(legacy_guids)} GUIDs from {PROCESSED_FILE} to {PROCESSED_DB}")
+
+    return db
+
+
+def load_feed_cache():
+    """Load the stored HTTP validators (ETag / Last-Modified) for each feed."""
+    if FEED_CACHE_FILE.exists():
+        try:
+            return read_json(FEED_CACHE_FILE)
+        except ValueError:
+            return {}
+    return {}
+
+
+def save_feed_cache(feed_cache):
+    """Save the HTTP validators for each feed."""
+    write_json_atomic(FEED_CACHE_FILE, feed_cache)
+
+
+def _parse_item(item, feed_type):
+    """Build an item dict from an RSS <item> element."""
+    # Index the item's children by tag in one pass (first one wins), instead
+    # of scanning the children once per field. media:thumbnail is keyed by
+    # its local name so it is found whatever namespace URI the feed uses.
+    fields = {}
+    for child in item:
+        tag = child.tag
+        if not isinstance(tag, str):  # skip comments / processing instructions
+            continue
+        if tag.endswith('}thumbnail'):
+            tag = 'thumbnail'
+        fields.setdefault(tag, child)
+
+    def text(name):
+        element = fields.get(name)
+        return (element.text or '') if element is not None else ''
+
+    # Extract data from RSS item
+    title_text = text('title').strip() or "No title"
+    pub_date_text = text('pubDate').strip()
+    desc_text = text('description')  # Keep HTML for link extraction
+
+    # Extract link - try RSS link tag first, then HTML in description
+    link_url = text('link').strip()
+
+    # If no link, extract from description HTML
+    if not link_url:
+        href_match = _HREF_RE.search(desc_text)
+        if href_match:
+            link_url = href_match.group(1)
+
+    guid_text = text('guid').strip()
+    author_text = text('author').strip() or "Unknown"
+
+    # Look for thumbnail/media (media:thumbnail in any namespace, or bare)
+    thumbnail = fields.get('thumbnail')
+    thumbnail_url = thumbnail.get('url', '') if thumbnail is not None else ""
+
+    # Clean up description - remove HTML tags
+    desc_clean = _TAG_RE.sub('', desc_text).strip()
+
+    return {
+        'type': feed_type,
+        'title': title_text,
+        'link': link_url,
+        'published': pub_date_text,
+        'description': desc_clean,
+        'guid': guid_text,
+        'author': author_text,
+        'thumbnail': thumbnail_url,
+        'fetched_at': datetime.now().isoformat(),
+    }
 
 
-def save_processed_guids(guids):
-    """Save the list of processed GUIDs."""
-    with open(PROCESSED_FILE, 'w') as f:
-        json.dump(list(guids), f)
+def _drain_items(parser, feed_type, parsed_items):
+    """Parse the <item> elements the pull parser has completed so far."""
+    for _, item in parser.read_events():
+        try:
+            parsed = _parse_item(item, feed_type)
+            # GUIDs are the dedupe key; an item without one is usually the
+            # half-read last item of a cut-off body that recover=True closed
+            if parsed['guid']:
+                parsed_items.append(parsed)
+            else:
+                print(f"    Warning: Skipping {feed_type} item without a GUID")
+        except Exception as e:
+            print(f"    Warning: Could not parse item: {e}")
+        finally:
+            # Release the item and any earlier siblings so memory stays
+            # bounded by one item rather than the whole feed
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
 
 
-def parse_rss_feed(feed_url, feed_type):
-    """Fetch and parse an RSS feed."""
+def parse_rss_feed(feed_url, feed_type, session=None, feed_cache=None):
+    """
+    Fetch and parse an RSS feed.
+
+    The response is streamed into lxml's pull parser chunk by chunk, so
+    neither the raw body nor the full tree is ever held in memory at once.
+
+    If feed_cache is given, the request is conditional on the feed's stored
+    ETag / Last-Modified. An unchanged feed (304) returns no items without
+    being downloaded or parsed, and a changed one updates feed_cache.
+    """
     print(f"  Fetching {feed_type} feed...")
 
+    session = session or _SESSION
+    headers = {}
+    validators = (feed_cache or {}).get(feed_url) or {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    # recover=True tolerates the occasional malformed entity; entities and
+    # network access stay disabled
+    parser = etree.XMLPullParser(
+        events=('end',),
+        tag='item',
+        recover=True,
+        resolve_entities=False,
+        no_network=True
+    )
+    parsed_items = []
+
     try:
-        response = requests.get(feed_url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
+        with session.get(feed_url, headers=headers, timeout=10, stream=True) as response:
+            response.raise_for_status()
+
+            if response.status_code == 304:
+                print(f"  {feed_type} feed not modified since last poll")
+                return []
+
+            for chunk in response.iter_content(chunk_size=FEED_CHUNK_BYTES):
+                parser.feed(chunk)
+                _drain_items(parser, feed_type, parsed_items)
+
+            parser.close()
+            _drain_items(parser, feed_type, parsed_items)
+
+            # Only remember validators once the whole body has been parsed
+            if feed_cache is not None:
+                feed_cache[feed_url] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
     except requests.RequestException as e:
         print(f"  ERROR fetching {feed_type} feed: {e}")
         return []
-
-    soup = BeautifulSoup(response.content, 'html.parser')
-    items = soup.find_all('item')
-
-    parsed_items = []
-    for item in items:
-        try:
-            # Extract data from RSS item
-            title = item.find('title')
-            title_text = title.get_text(strip=True) if title else "No title"
-
-            # Try multiple ways to find pubDate (case variations due to HTML parser)
-            pub_date_text = ""
-            for tag_name in ['pubdate', 'pubDate', 'pubdate', 'pubDate']:
-                pub_date = item.find(tag_name)
-                if pub_date:
-                    pub_date_text = pub_date.get_text(strip=True)
-                    break
-
-            description = item.find('description')
-            desc_text = description.get_text() if description else ""  # Keep HTML for link extraction
-
-            # Extract link - try RSS link tag first, then HTML in description
-            link_url = ""
-            link = item.find('link')
-            if link and link.string:
-                link_url = link.string.strip()
-
-            # If no link, extract from description HTML
-            if not link_url:
-                href_match = re.search(r'href=[\'"]([^\'"]*dvidshub\.net[^\'"]*)[\'"]', desc_text)
-                if href_match:
-                    link_url = href_match.group(1)
-
-            guid = item.find('guid')
-            guid_text = guid.get_text(strip=True) if guid else ""
-
-            author = item.find('author')
-            author_text = author.get_text(strip=True) if author else "Unknown"
-
-            # Look for thumbnail/media (try both namespace and non-namespace variants)
-            thumbnail = item.find('media:thumbnail') or item.find('thumbnail')
-            thumbnail_url = thumbnail.get('url', '') if thumbnail else ""
-
-            # Clean up description - remove HTML tags
-            desc_clean = re.sub(r'<[^>]+>', '', desc_text).strip()
-
-            parsed_item = {
-                'type': feed_type,
-                'title': title_text,
-                'link': link_url,
-                'published': pub_date_text,
-                'description': desc_clean,
-                'guid': guid_text,
-                'author': author_text,
-                'thumbnail': thumbnail_url,
-                'fetched_at': datetime.now().isoformat(),
-            }
-
-            parsed_items.append(parsed_item)
-        except Exception as e:
-            print(f"    Warning: Could not parse item: {e}")
-            continue
+    except etree.LxmlError as e:
+        # Empty or unrecoverable body; keep whatever parsed before the error
+        # (validators aren't stored, so the next poll refetches the feed)
+        print(f"  ERROR parsing {feed_type} feed: {e}")
+        print(f"  Keeping {len(parsed_items)} {feed_type} items parsed before the error")
+        return parsed_items
 
     print(f"  Found {len(parsed_items)} {feed_type} items")
     return parsed_items
@@ -134,11 +263,20 @@ def fetch_all_content():
     print(f"Starting fetch at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
     all_items = []
+    feed_cache = load_feed_cache()
+
+    # Fetch all feeds at once: each fetch is network-bound, so the total
+    # wait is the slowest feed rather than the sum of all of them.
+    # Results are collected in RSS_FEEDS order.
+    with ThreadPoolExecutor(max_workers=len(RSS_FEEDS)) as executor:
+        results = executor.map(
+            lambda feed: parse_rss_feed(feed[1], feed[0], _SESSION, feed_cache),
+            RSS_FEEDS.items()
+        )
+        for items in results:
+            all_items.extend(items)
 
-    # Fetch from each feed
-    for feed_type, feed_url in RSS_FEEDS.items():
-        items = parse_rss_feed(feed_url, feed_type)
-        all_items.extend(items)
+    save_feed_cache(feed_cache)
 
     print(f"\nTotal items fetched: {len(all_items)}")
 
@@ -147,23 +285,53 @@ def fetch_all_content():
 
 def identify_new_items(all_items):
     """Identify which items are new based on GUID tracking."""
-    processed_guids = load_processed_guids()
+    db = _get_processed_db()
+    now = int(time.time())
 
     new_items = []
-    for item in all_items:
-        if item['guid'] not in processed_guids:
-            new_items.append(item)
+    try:
+        # One transaction for the whole poll; the insert doubles as the
+        # membership check (rowcount is 0 when the GUID was already seen)
+        with db:
+            for item in all_items:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO seen (guid, first_seen) VALUES (?, ?)",
+                    (item['guid'], now)
+                )
+                if cursor.rowcount:
+                    new_items.append(item)
+
+            if new_items:
+                db.execute(
+                    """
+                    DELETE FROM seen WHERE guid IN (
+                        SELECT guid FROM seen ORDER BY first_seen DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (PROCESSED_MAX_GUIDS,)
+                )
+    finally:
+        db.close()
 
     print(f"New items (not seen before): {len(new_items)}")
 
-    # Update processed GUIDs
-    for item in all_items:
-        processed_guids.add(item['guid'])
-    save_processed_guids(processed_guids)
-
     return new_items
 
 
+def warm_guid_cache():
+    """
+    Mark every item currently in the feeds as seen, without returning any.
+
+    Used when monitoring starts after a stretch with no topics, so the feed
+    backlog isn't reported as new (and sent for analysis) all at once.
+
+    Returns:
+        Number of GUIDs that were newly recorded
+    """
+    all_items = fetch_all_content()
+    return len(identify_new_items(all_items))
+
+
 def save_current_items(items):
     """Save current items to JSON file."""
     # Prepare for JSON (convert any non-serializable items)
@@ -173,14 +341,21 @@ def save_current_items(items):
         'items': items
     }
 
-    with open(CURRENT_ITEMS_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+    write_json_atomic(CURRENT_ITEMS_FILE, output)
 
     print(f"Saved {len(items)} items to {CURRENT_ITEMS_FILE}")
 
 
-def main():
-    """Main execution. Scrapes DVIDS and returns new items found."""
+def main(save_items=True):
+    """
+    Main execution. Scrapes DVIDS and returns new items found.
+
+    Args:
+        save_items: Also write the new items to CURRENT_ITEMS_FILE for a
+            separate analyzer.py run. The pipeline passes False since it
+            uses the returned list directly; set DUMP_CURRENT_ITEMS=1 to
+            keep the file anyway (e.g. for debugging).
+    """
     try:
         # Step 1: Fetch all content
         all_items = fetch_all_content()
@@ -189,7 +364,8 @@ def main():
         new_items = identify_new_items(all_items)
 
         # Step 3: Save for later processing
-        save_current_items(new_items)
+        if save_items or os.getenv('DUMP_CURRENT_ITEMS'):
+            save_current_items(new_items)
 
         print("\n" + "="*70)
         print("Scraping complete!")
@@ -0,0 +1,77 @@
+"""Regression tests for scraper.parse_rss_feed on empty and cut-off feed bodies."""
+
+import unittest
+
+import scraper
+
+
+class _FakeResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+
+    def __init__(self, body):
+        self.body = body
+        self.status_code = 200
+        self.headers = {'ETag': '"abc"'}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class _FakeSession:
+    """Session whose get() always answers with the given body."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, **kwargs):
+        return _FakeResponse(self.body)
+
+
+FEED_URL = 'https://example.com/rss'
+
+ITEM = (
+    b'<item><title>Title {n}</title><link>https://example.com/{n}</link>'
+    b'<guid>guid-{n}</guid><description>Description</description></item>'
+)
+
+
+def _feed(item_count, close=True):
+    items = b''.join(ITEM.replace(b'{n}', str(n).encode()) for n in range(item_count))
+    body = b'<?xml version="1.0"?><rss><channel>' + items
+    if close:
+        body += b'</channel></rss>'
+    return body
+
+
+class ParseRssFeedTests(unittest.TestCase):
+
+    def test_complete_feed(self):
+        cache = {}
+        items = scraper.parse_rss_feed(FEED_URL, 'news', _FakeSession(_feed(3)), cache)
+        self.assertEqual([item['guid'] for item in items], ['guid-0', 'guid-1', 'guid-2'])
+        self.assertIn(FEED_URL, cache)
+
+    def test_empty_body_returns_no_items(self):
+        cache = {}
+        items = scraper.parse_rss_feed(FEED_URL, 'news', _FakeSession(b''), cache)
+        self.assertEqual(items, [])
+        self.assertNotIn(FEED_URL, cache)
+
+    def test_truncated_body_keeps_completed_items(self):
+        body = _feed(2, close=False) + b'<item><title>Cut o'
+        items = scraper.parse_rss_feed(FEED_URL, 'news', _FakeSession(body), {})
+        self.assertEqual([item['guid'] for item in items], ['guid-0', 'guid-1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,13 +6,58 @@ Topics are now stored in Google Sheets for shared access between web and worker
 """
 
 import os
+import sys
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from uuid import uuid4
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional
 import gspread
 
 
-# Initialize Google Sheets client
+# Topic validation rules
+REQUIRED_TOPIC_FIELDS = ('name', 'keywords', 'sheet_id', 'sheet_name')
+MIN_SCORE_THRESHOLD = 1
+MAX_SCORE_THRESHOLD = 10
+
+# Fields update_topic may change
+UPDATABLE_TOPIC_FIELDS = frozenset(['name', 'keywords', 'slack_webhook', 'score_threshold', 'active'])
+
+# How long load_topics() may serve topics from memory before re-reading the
+# sheet. Topics change rarely, and every read is a full-sheet download that
+# counts against the Sheets API read quota. Defaults to three worker poll
+# intervals so most polls are served from memory; writes made in this process
+# invalidate the cache, and the worker picks up web UI edits within the TTL.
+TOPICS_CACHE_TTL_SECONDS = int(os.getenv(
+    'TOPICS_CACHE_TTL_SECONDS',
+    3 * int(os.getenv('POLL_INTERVAL_SECONDS', 300))
+))
+
+_topics_cache = {'ts': 0.0, 'data': None, 'by_id': None, 'active': None}
+
+# Sheet row number of each topic ID, refreshed on every full read. Used as a
+# hint by update_topic, which confirms the ID in the row before writing.
+_row_index_by_id: Dict[str, int] = {}
+
+
+def _invalidate_topics_cache() -> None:
+    """Force the next load_topics() call to re-read the sheet."""
+    _topics_cache['ts'] = 0.0
+    _topics_cache['data'] = None
+    _topics_cache['by_id'] = None
+    _topics_cache['active'] = None
+
+
+def _invalidate_worksheet_cache() -> None:
+    """Drop the memoized client and Topics worksheet so they are reopened."""
+    _get_topics_worksheet.cache_clear()
+    _get_sheets_client.cache_clear()
+
+
+# Initialize Google Sheets client (once per process)
+@lru_cache(maxsize=1)
 def _get_sheets_client():
     """Get authenticated Google Sheets client."""
     try:
@@ -31,8 +76,14 @@ def _get_sheets_client():
         return gspread.service_account(filename=str(credentials_file))
 
 
+@lru_cache(maxsize=1)
 def _get_topics_worksheet():
-    """Get or create the Topics worksheet in the main spreadsheet."""
+    """
+    Get or create the Topics worksheet in the main spreadsheet.
+
+    Memoized: opening it costs two metadata requests. Call
+    _invalidate_worksheet_cache() if the handle stops working.
+    """
     client = _get_sheets_client()
     spreadsheet_id = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID')
 
@@ -61,6 +112,52 @@ def _get_topics_worksheet():
     return worksheet
 
 
+def _index_topic_rows(rows: List[List]) -> None:
+    """Rebuild the topic ID -> sheet row number index from a full read."""
+    _row_index_by_id.clear()
+    for idx, row in enumerate(rows[1:], start=2):
+        if row and row[0]:
+            _row_index_by_id[row[0]] = idx
+
+
+def _find_topic_row(worksheet, topic_id: str) -> tuple[Optional[int], Optional[List]]:
+    """
+    Locate a topic's row, reading a single row when its position is known.
+
+    Returns (row_number, row_values), or (None, None) if the topic is absent.
+    """
+    idx = _row_index_by_id.get(topic_id)
+    if idx is not None:
+        row = worksheet.row_values(idx)
+        if row and row[0] == topic_id:
+            return idx, row
+
+    # Unknown or stale position (rows added or removed elsewhere): full read
+    rows = worksheet.get_all_values()
+    _index_topic_rows(rows)
+    idx = _row_index_by_id.get(topic_id)
+    if idx is None:
+        return None, None
+    return idx, rows[idx - 1]
+
+
+def _normalize_keywords(keywords) -> List[str]:
+    """
+    Strip and lowercase keywords, dropping blanks and duplicates.
+
+    Order is preserved. Keywords are interned, so topics sharing a word
+    share one string object.
+    """
+    seen = set()
+    normalized = []
+    for keyword in keywords:
+        keyword = keyword.strip().lower()
+        if keyword and keyword not in seen:
+            seen.add(keyword)
+            normalized.append(sys.intern(keyword))
+    return normalized
+
+
 def _row_to_topic(row: List) -> Optional[Dict]:
     """Convert a worksheet row to a topic dictionary."""
     if not row or len(row) < 8:
@@ -70,7 +167,7 @@ def _row_to_topic(row: List) -> Optional[Dict]:
         return {
             'id': row[0],
             'name': row[1],
-            'keywords': [k.strip().lower() for k in row[2].split(',') if k.strip()],
+            'keywords': _normalize_keywords(row[2].split(',')),
             'sheet_id': row[3],
             'sheet_name': row[4],
             'slack_webhook': row[5] if row[5] else None,
@@ -99,23 +196,58 @@ def _topic_to_row(topic: Dict) -> List:
     ]
 
 
-def load_topics() -> List[Dict]:
-    """Load all topics from Google Sheets."""
+def _freeze_topic(topic: Dict) -> Mapping:
+    """Wrap a topic in a read-only view (keywords become a tuple)."""
+    return MappingProxyType({**topic, 'keywords': tuple(topic['keywords'])})
+
+
+def _cached_topics() -> tuple[List[Mapping], Dict[str, Mapping], List[Mapping]]:
+    """
+    Get the cached topic list, its id -> topic index and its active topics,
+    re-reading the sheet when the cache is empty or older than
+    TOPICS_CACHE_TTL_SECONDS.
+
+    Topics are read-only views shared by every caller, so they can be
+    handed out without copying; the lists must not be mutated.
+    """
+    cached = _topics_cache['data']
+    if cached is not None and time.monotonic() - _topics_cache['ts'] < TOPICS_CACHE_TTL_SECONDS:
+        return cached, _topics_cache['by_id'], _topics_cache['active']
+
     try:
         worksheet = _get_topics_worksheet()
         rows = worksheet.get_all_values()
+        _index_topic_rows(rows)
 
         # Skip header row
         topics = []
         for row in rows[1:]:
             topic = _row_to_topic(row)
             if topic:
-                topics.append(topic)
+                topics.append(_freeze_topic(topic))
 
-        return topics
+        _topics_cache['data'] = topics
+        _topics_cache['by_id'] = {topic['id']: topic for topic in topics}
+        _topics_cache['active'] = [topic for topic in topics if topic.get('active', True)]
+        _topics_cache['ts'] = time.monotonic()
+        return topics, _topics_cache['by_id'], _topics_cache['active']
     except Exception as e:
         print(f"Error loading topics from Sheets: {e}")
-        return []
+        # Re-open the worksheet next time in case it was deleted or renamed
+        _invalidate_worksheet_cache()
+        return [], {}, []
+
+
+def load_topics() -> List[Mapping]:
+    """
+    Load all topics from Google Sheets.
+
+    Results are cached for TOPICS_CACHE_TTL_SECONDS; writes made through this
+    module invalidate the cache immediately. Topics are returned as shared
+    read-only mappings; use dict(topic) to get an editable copy.
+    """
+    topics, _, _ = _cached_topics()
+    return list(topics)
 
 
 def save_topics(topics: List[Dict]) -> None:
@@ -125,14 +257,19 @@ def save_topics(topics: List[Dict]) -> None:
     Note: This function is kept for compatibility but is not used directly.
     Individual CRUD operations update Sheets directly.
     """
+    _invalidate_topics_cache()
+    _row_index_by_id.clear()
     try:
         worksheet = _get_topics_worksheet()
         # Clear all data rows (keep header)
         worksheet.delete_rows(2, worksheet.row_count)
 
-        # Write all topics
-        for topic in topics:
-            worksheet.append_row(_topic_to_row(topic))
+        # Write all topics with a single request
+        if topics:
+            worksheet.append_rows(
+                [_topic_to_row(topic) for topic in topics],
+                value_input_option='RAW'
+            )
     except Exception as e:
         print(f"Error saving topics to Sheets: {e}")
         raise
@@ -144,25 +281,103 @@ def validate_topic(topic: Dict) -> tuple[bool, str]:
 
     Returns (is_valid, error_message)
     """
-    required_fields = ['name', 'keywords', 'sheet_id', 'sheet_name']
-
-    for field in required_fields:
+    for field in REQUIRED_TOPIC_FIELDS:
         if field not in topic or not topic[field]:
             return False, f"Missing required field: {field}"
 
-    if not isinstance(topic['keywords'], list) or len(topic['keywords']) == 0:
+    # Cached topics carry keywords as a tuple (see _freeze_topic)
+    if not isinstance(topic['keywords'], (list, tuple)) or len(topic['keywords']) == 0:
         return False, "Keywords must be a non-empty list"
 
     if not isinstance(topic['name'], str) or len(topic['name'].strip()) == 0:
         return False, "Topic name must be a non-empty string"
 
     score_threshold = topic.get('score_threshold', 5)
-    if not isinstance(score_threshold, int) or score_threshold < 1 or score_threshold > 10:
+    if not isinstance(score_threshold, int) or not MIN_SCORE_THRESHOLD <= score_threshold <= MAX_SCORE_THRESHOLD:
         return False, "Score threshold must be between 1 and 10"
 
     return True, ""
 
 
+# Batch currently collecting this thread's writes (see TopicBatch), if any.
+# Thread-local so a batch in one request thread never captures another's writes.
+_batch_local = threading.local()
+
+
+def _active_batch() -> Optional['TopicBatch']:
+    """Return the TopicBatch open in the current thread, if any."""
+    return getattr(_batch_local, 'batch', None)
+
+
+class TopicBatch:
+    """
+    Coalesce topic writes into at most two Sheets requests.
+
+    Inside a ``with TopicBatch():`` block, create_topic, update_topic and
+    delete_topic stage their rows instead of writing them. On a clean exit,
+    all updated rows go out in one batch_update and all new rows in one
+    append_rows. If the block raises, nothing is written.
+
+    A batch only collects writes made by the thread that opened it; other
+    threads keep writing directly. Batches can't be nested.
+
+    Example:
+        with TopicBatch():
+            for topic_id in stale_ids:
+                delete_topic(topic_id)
+    """
+
+    def __init__(self):
+        # topic ID -> (sheet row number, or None for new topics, topic dict)
+        self.staged: Dict[str, tuple[Optional[int], Dict]] = {}
+
+    def stage(self, row_idx: Optional[int], topic: Dict) -> None:
+        """Record the latest version of a topic to write on exit."""
+        self.staged[topic['id']] = (row_idx, topic)
+
+    def __enter__(self):
+        if _active_batch() is not None:
+            raise RuntimeError("TopicBatch blocks cannot be nested")
+        _batch_local.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _batch_local.batch = None
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def flush(self) -> None:
+        """Write all staged topics to the sheet."""
+        if not self.staged:
+            return
+
+        updates = [
+            {'range': f'A{row_idx}:J{row_idx}', 'values': [_topic_to_row(topic)]}
+            for row_idx, topic in self.staged.values()
+            if row_idx is not None
+        ]
+        new_rows = [
+            _topic_to_row(topic)
+            for row_idx, topic in self.staged.values()
+            if row_idx is None
+        ]
+
+        try:
+            worksheet = _get_topics_worksheet()
+            if updates:
+                worksheet.batch_update(updates, value_input_option='RAW')
+            if new_rows:
+                worksheet.append_rows(new_rows, value_input_option='RAW')
+            print(f"  ✓ Wrote {len(updates)} updated and {len(new_rows)} new topic(s)")
+        except Exception as e:
+            _invalidate_worksheet_cache()
+            raise RuntimeError(f"Failed to write topic batch to Google Sheets: {e}")
+        finally:
+            self.staged.clear()
+            _invalidate_topics_cache()
+
+
 def create_topic(
     name: str,
     keywords: List[str],
@@ -185,17 +400,18 @@ def create_topic(
     Returns:
         Created topic dictionary with ID and timestamp
     """
+    now_iso = datetime.now().isoformat()
     topic = {
         "id": str(uuid4()),
         "name": name.strip(),
-        "keywords": [k.strip().lower() for k in keywords if k.strip()],
+        "keywords": _normalize_keywords(keywords),
         "sheet_id": sheet_id,
         "sheet_name": sheet_name[:100],  # Google Sheets worksheet name limit
         "slack_webhook": slack_webhook,
         "score_threshold": score_threshold,
         "active": True,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
+        "created_at": now_iso,
+        "updated_at": now_iso
     }
 
     # Validate before saving
@@ -203,23 +419,29 @@ def create_topic(
     if not is_valid:
         raise ValueError(f"Invalid topic: {error}")
 
+    # Inside a TopicBatch the row is written when the batch exits
+    batch = _active_batch()
+    if batch is not None:
+        batch.stage(None, topic)
+        return topic
+
     # Add to Sheets
     try:
         worksheet = _get_topics_worksheet()
         worksheet.append_row(_topic_to_row(topic))
     except Exception as e:
+        _invalidate_worksheet_cache()
         raise RuntimeError(f"Failed to create topic in Google Sheets: {e}")
+    finally:
+        _invalidate_topics_cache()
 
     return topic
 
 
-def get_topic_by_id(topic_id: str) -> Optional[Dict]:
-    """Get a specific topic by ID."""
-    topics = load_topics()
-    for topic in topics:
-        if topic['id'] == topic_id:
-            return topic
-    return None
+def get_topic_by_id(topic_id: str) -> Optional[Mapping]:
+    """Get a specific topic by ID (as a read-only mapping)."""
+    _, topics_by_id, _ = _cached_topics()
+    return topics_by_id.get(topic_id)
 
 
 def update_topic(topic_id: str, **updates) -> Optional[Dict]:
@@ -235,32 +457,37 @@ def update_topic(topic_id: str, **updates) -> Optional[Dict]:
     """
     try:
         worksheet = _get_topics_worksheet()
-        rows = worksheet.get_all_values()
-
-        # Find the topic row
-        topic_row_idx = None
-        for idx, row in enumerate(rows[1:], start=2):
-            if row and row[0] == topic_id:
-                topic_row_idx = idx
-                break
-
-        if topic_row_idx is None:
-            return None
-
-        # Convert row to topic
-        topic = _row_to_topic(rows[topic_row_idx - 1])
-        if not topic:
-            return None
+        batch = _active_batch()
+
+        if batch is not None and topic_id in batch.staged:
+            # Build on the version already staged in this batch
+            topic_row_idx, staged_topic = batch.staged[topic_id]
+            topic = dict(staged_topic)
+        else:
+            # Find the topic row
+            topic_row_idx, row = _find_topic_row(worksheet, topic_id)
+            if topic_row_idx is None:
+                return None
+
+            # Convert row to topic
+            topic = _row_to_topic(row)
+            if not topic:
+                return None
 
         # Update allowed fields only
-        allowed_fields = ['name', 'keywords', 'slack_webhook', 'score_threshold', 'active']
+        original = dict(topic)
         for field, value in updates.items():
-            if field in allowed_fields:
-                if field == 'keywords' and isinstance(value, list):
-                    topic[field] = [k.strip().lower() for k in value if k.strip()]
+            if field in UPDATABLE_TOPIC_FIELDS:
+                if field == 'keywords' and isinstance(value, (list, tuple)):
+                    topic[field] = _normalize_keywords(value)
                 else:
                     topic[field] = value
 
+        # Nothing changed (e.g. the UI re-submitted the current values):
+        # skip the write and keep updated_at as it was
+        if topic == original:
+            return topic
+
         topic['updated_at'] = datetime.now().isoformat()
 
         # Validate after update
@@ -268,15 +495,22 @@ def update_topic(topic_id: str, **updates) -> Optional[Dict]:
         if not is_valid:
             raise ValueError(f"Invalid update: {error}")
 
+        # Inside a TopicBatch the row is written when the batch exits
+        if batch is not None:
+            batch.stage(topic_row_idx, topic)
+            return topic
+
         # Update the row in Sheets
         row_data = _topic_to_row(topic)
         print(f"  Updating row {topic_row_idx} with data: {row_data}")
         worksheet.update_values(f'A{topic_row_idx}:J{topic_row_idx}', [row_data])
+        _invalidate_topics_cache()
         print(f"  ✓ Row updated successfully")
         return topic
 
     except Exception as e:
         print(f"Error updating topic {topic_id}: {e}")
+        _invalidate_worksheet_cache()
         import traceback
         traceback.print_exc()
         return None
@@ -293,7 +527,40 @@ def delete_topic(topic_id: str) -> bool:
         True if deleted, False if not found
     """
     print(f"Deleting topic {topic_id}...")
-    result = update_topic(topic_id, active=False)
+    result = None
+    try:
+        worksheet = _get_topics_worksheet()
+        batch = _active_batch()
+
+        if batch is not None and topic_id in batch.staged:
+            topic_row_idx, staged_topic = batch.staged[topic_id]
+            result = dict(staged_topic)
+        else:
+            topic_row_idx, row = _find_topic_row(worksheet, topic_id)
+            if topic_row_idx is not None:
+                result = _row_to_topic(row)
+
+        # Only the active flag and timestamp change, so there is nothing
+        # to revalidate; an already-inactive topic needs no write at all
+        if result and result['active']:
+            result['active'] = False
+            result['updated_at'] = datetime.now().isoformat()
+
+            if batch is not None:
+                batch.stage(topic_row_idx, result)
+            else:
+                # Columns H:J are active, created_at, updated_at
+                worksheet.update_values(
+                    f'H{topic_row_idx}:J{topic_row_idx}',
+                    [['false', result['created_at'], result['updated_at']]]
+                )
+                _invalidate_topics_cache()
+
+    except Exception as e:
+        print(f"Error deleting topic {topic_id}: {e}")
+        _invalidate_worksheet_cache()
+        result = None
+
     if result:
         print(f"✓ Topic '{result['name']}' marked as inactive")
         return True
@@ -302,18 +569,18 @@ def delete_topic(topic_id: str) -> bool:
         return False
 
 
-def list_active_topics() -> List[Dict]:
-    """Get all active topics."""
-    topics = load_topics()
-    return [topic for topic in topics if topic.get('active', True)]
+def list_active_topics() -> List[Mapping]:
+    """Get all active topics (partitioned once per cache refresh)."""
+    _, _, active_topics = _cached_topics()
+    return list(active_topics)
 
 
-def list_all_topics() -> List[Dict]:
+def list_all_topics() -> List[Mapping]:
     """Get all topics including inactive ones."""
     return load_topics()
 
 
-def get_topic_sheet_url(topic: Dict) -> str:
+def get_topic_sheet_url(topic: Mapping) -> str:
     """Generate Google Sheets URL for a topic."""
     return f"https://docs.google.com/spreadsheets/d/{topic['sheet_id']}"
 